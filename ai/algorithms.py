@@ -127,7 +127,7 @@ def _alpha_beta_min(board: Board, depth: int, alpha: int, beta: int, player: boo
 
     best = HIGH_BOUND
     i = 0
-    for move in board.legal_moves:
+    for move in board.ordered_legal_moves:
         board.make_move(move)
         score, counter = _alpha_beta_max(board, depth - 1, alpha, beta, player, board_eval, counter)
         board.unmake_move()
@@ -154,7 +154,7 @@ def _alpha_beta_max(board: Board, depth: int, alpha: int, beta: int, player: boo
 
     best = LOW_BOUND
     i = 0
-    for move in board.legal_moves:
+    for move in board.ordered_legal_moves:
         board.make_move(move)
         score, counter = _alpha_beta_min(board, depth - 1, alpha, beta, player, board_eval, counter)
         board.unmake_move()
@@ -149,14 +149,6 @@ def bitboard_to_slots(bb: Bitboard) -> Iterable[Slot]:
         bb ^= BB_SLOTS[r]
 
 
-def binary_str(i: int) -> str:
-    """Returns a base 2 integer as a binary string of length 64."""
-    s = '{0:b}'.format(i)
-    s = ('0' * (42 - len(s))) + s  # Pad with zeroes
-    assert len(s) == 42
-    return s
-
-
 def bitboard_to_str(bb: Bitboard) -> str:
     """Prints a visual representation of the occupation represented by the input bitboard integer."""
     board_str = ''
@@ -167,7 +159,7 @@ def bitboard_to_str(bb: Bitboard) -> str:
             board_str += f'\n{sq_rank + 1} '
             rank = sq_rank
 
-        if binary_str(bb)[41 - sq] == '1':
+        if (bb >> sq) & 1:
             board_str += '[•]'
         else:
             board_str += '[ ]'
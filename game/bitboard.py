@@ -1,9 +1,8 @@
-from typing import List, Iterable
+from typing import Dict, Iterable, Tuple
 
 from game.square import *
 from game.constants import (
-    BLACK,
-    WHITE,
+    Direction,
 
     NORTH,
     NORTHEAST,
@@ -26,32 +25,25 @@ def msb(x: Bitboard) -> int:
 
 def lsb(x: Bitboard) -> int:
     """Returns least significant bit."""
-    return msb(x & -x)
+    return (x & -x).bit_length() - 1
 
 
-def binary_str(i: int) -> str:
-    """Returns a base 2 integer as a binary string of length 64."""
-    s = '{0:b}'.format(i)
-    s = ('0' * (64 - len(s))) + s  # Pad with zeroes
-    assert len(s) == 64
-    return s
+try:
+    popcount = int.bit_count  # Python 3.10+
+except AttributeError:
+    def popcount(bb: Bitboard) -> int:
+        """Number of squares set in the given bitboard."""
+        return bin(bb).count('1')
 
-
-def bit_count(i: Bitboard) -> int:
-    """Number of bits set to 1 in the given integer."""
-    count = 0
-    while i:
-        i &= i - 1
-        count += 1
-    return count
+bit_count = popcount  # Number of bits set to 1 in the given integer
 
 
 def bitboard_to_squares(bb: Bitboard) -> Iterable[Square]:
     """Returns squares populated in a given bitboard."""
     while bb:
-        r = bb.bit_length() - 1
-        yield Square(r)
-        bb ^= BB_SQUARES[r]
+        _lsb = bb & -bb
+        yield _lsb.bit_length() - 1
+        bb ^= _lsb
 
 
 def bitboard_to_str(bb: Bitboard) -> str:
@@ -59,11 +51,11 @@ def bitboard_to_str(bb: Bitboard) -> str:
     board_str = ''
     rank = 8
     for sq in SQUARES_VFLIP:
-        if rank > sq.rank:
-            board_str += f'\n{sq.rank + 1} '
-            rank = sq.rank
+        if rank > square_rank(sq):
+            rank = square_rank(sq)
+            board_str += f'\n{rank + 1} '
 
-        if binary_str(bb)[63 - sq] == '1':
+        if (bb >> sq) & 1:
             board_str += '[•]'
         else:
             board_str += '[ ]'
@@ -96,7 +88,7 @@ BB_SQUARES = [
     BB_A6, BB_B6, BB_C6, BB_D6, BB_E6, BB_F6, BB_G6, BB_H6,
     BB_A7, BB_B7, BB_C7, BB_D7, BB_E7, BB_F7, BB_G7, BB_H7,
     BB_A8, BB_B8, BB_C8, BB_D8, BB_E8, BB_F8, BB_G8, BB_H8,
-] = [1 << sq for sq in SQUARES]
+] = tuple(1 << sq for sq in SQUARES)
 
 BB_FILES = [
     BB_FILE_A,
@@ -107,11 +99,11 @@ BB_FILES = [
     BB_FILE_F,
     BB_FILE_G,
     BB_FILE_H,
-] = [
+] = tuple(
     # Create a set of the first file (A) and then iteratively shift all positions eastward 1 square
     (BB_A1 | BB_A2 | BB_A3 | BB_A4 | BB_A5 | BB_A6 | BB_A7 | BB_A8) << (i * BB_DIRECTIONS['e'])
     for i in range(8)
-]
+)
 
 BB_RANKS = [
     BB_RANK_1,
@@ -122,81 +114,65 @@ BB_RANKS = [
     BB_RANK_6,
     BB_RANK_7,
     BB_RANK_8,
-] = [
+] = tuple(
     # Create a set of the first rank (1) and then iteratively shift all positions northward 1 square
     (BB_A1 | BB_B1 | BB_C1 | BB_D1 | BB_E1 | BB_F1 | BB_G1 | BB_H1) << (i * BB_DIRECTIONS['n'])
     for i in range(8)
-]
+)
 
 
-def _gen_moves(intervals: Iterable[Tuple[int, int]]) -> List[Bitboard]:
-    bbs = []
-    for sq in SQUARES:
-        moves = BB_EMPTY
-        for i, j in intervals:
-            _file = sq.file + i
-            _rank = sq.rank + j
-            if 0 <= _file < 8 and 0 <= _rank < 8:  # Checks within the game
-                _sq = file_rank_to_index(sq.file + i, sq.rank + j)
-                moves |= BB_SQUARES[_sq]
-        bbs.append(moves)
-    return bbs
+def _shift_mask(file_shift: int) -> Bitboard:
+    """Returns the squares which stay on the same rank when moved by the given number of files."""
+    mask = BB_BOARD
+    wrapped = range(8 - file_shift, 8) if file_shift > 0 else range(-file_shift)
+    for _file in wrapped:
+        mask &= ~BB_FILES[_file]
+    return mask
+
+
+def _shift(bb: Bitboard, shift: int) -> Bitboard:
+    """Shifts every square of a bitboard by the given number of squares, dropping any that leave the board."""
+    return ((bb << shift) & BB_BOARD) if shift >= 0 else (bb >> -shift)
 
 
-def _gen_rays(file_adjust, rank_adjust) -> List[Bitboard]:
-    def _in_board(_file, _rank):
-        return 0 <= _file < 8 and 0 <= _rank < 8
+def _gen_moves(intervals: Iterable[Tuple[int, int]]) -> Tuple[Bitboard, ...]:
+    bbs = [BB_EMPTY] * 64
+    for i, j in intervals:
+        # Each interval is a single shift of the square, masked so it can't wrap around a file or off the board
+        mask = _shift_mask(i)
+        shift = i + (j * 8)
+        for sq in SQUARES:
+            bbs[sq] |= _shift(BB_SQUARES[sq] & mask, shift)
+    return tuple(bbs)
 
+
+def _gen_rays(file_adjust: int, rank_adjust: int) -> Tuple[Bitboard, ...]:
+    # Repeat the masked single step shift used by _gen_moves until the ray runs off the board
+    mask = _shift_mask(file_adjust)
+    shift = file_adjust + (rank_adjust * 8)
     bbs = []
     for sq in SQUARES:
         moves = BB_EMPTY
-        _file = sq.file
-        _rank = sq.rank
-        while _in_board(_file, _rank):  # Still in game
-            _file = _file + file_adjust
-            _rank = _rank + rank_adjust
-            if _in_board(_file, _rank):
-                _sq = file_rank_to_index(_file, _rank)
-                moves |= BB_SQUARES[_sq]
+        bb = _shift(BB_SQUARES[sq] & mask, shift)
+        while bb:
+            moves |= bb
+            bb = _shift(bb & mask, shift)
         bbs.append(moves)
-    return bbs
-
+    return tuple(bbs)
 
-def _double_pawn_advances(pawn_moves):
-    for _rank in (1, 6):
-        for _file in range(8):
-            i = file_rank_to_index(_file, _rank)
-            if _rank == 1:  # White pawns
-                single_move = pawn_moves[WHITE]['single'][i]
-                pawn_moves[WHITE]['double'][i] = single_move << 8  # Double move
-            else:
-                single_move = pawn_moves[BLACK]['single'][i]
-                pawn_moves[BLACK]['double'][i] = single_move >> 8  # Double move
-    return pawn_moves
 
-
-BB_ORIGINAL_ROOKS = {
-    WHITE: (BB_A1 | BB_H1),
-    BLACK: (BB_A8 | BB_H8),
-}
+BB_ORIGINAL_ROOKS = (  # Indexed by colour
+    BB_A8 | BB_H8,
+    BB_A1 | BB_H1,
+)
 BB_KNIGHT_MOVES = _gen_moves(((1, 2), (1, -2), (-1, 2), (-1, -2), (2, 1), (2, -1), (-2, 1), (-2, -1)))
 BB_KING_MOVES = _gen_moves(((1, 1), (0, 1), (1, 0), (-1, -1), (-1, 0), (0, -1), (1, -1), (-1, 1)))
-BB_PAWN_ATTACKS = {
-    WHITE: _gen_moves(((1, 1), (-1, 1))),
-    BLACK: _gen_moves(((1, -1), (-1, -1))),
-}
-BB_PAWN_MOVES = {
-    WHITE: {
-        'single': _gen_moves(((0, 1),)),  # Single advance
-        'double': [0] * 64,
-    },
-    BLACK: {
-        'single': _gen_moves(((0, -1),)),
-        'double': [0] * 64,
-    },
-}
 
-BB_PAWN_MOVES = _double_pawn_advances(BB_PAWN_MOVES)
+# Pawn tables are tuples indexed directly by colour, i.e. BLACK (False) at 0 and WHITE (True) at 1
+BB_PAWN_ATTACKS = (
+    _gen_moves(((1, -1), (-1, -1))),
+    _gen_moves(((1, 1), (-1, 1))),
+)
 
 BB_RAYS = {
     NORTH: _gen_rays(0, 1),
@@ -209,39 +185,129 @@ BB_RAYS = {
     NORTHWEST: _gen_rays(-1, 1),
 }
 
-BB_CARDINALS = [
+
+def _edges(sq: Square) -> Bitboard:
+    """Board edges that are not on the same rank or file as the given square."""
+    return (
+        ((BB_RANK_1 | BB_RANK_8) & ~BB_RANKS[square_rank(sq)]) |
+        ((BB_FILE_A | BB_FILE_H) & ~BB_FILES[square_file(sq)])
+    )
+
+
+def _slide_attacks(sq: Square, occupied: Bitboard, directions: Iterable[Direction]) -> Bitboard:
+    """Squares attacked from a square along the given rays, stopping at (and including) the first blocker of each."""
+    attacks = BB_EMPTY
+    for direction in directions:
+        rays = BB_RAYS[direction]
+        possible = rays[sq]
+        blockers = possible & occupied
+        if blockers:
+            # Only the nearest blocker matters: the lowest bit for rays heading up the board, else the highest
+            nearest = lsb(blockers) if BB_DIRECTIONS[direction] > 0 else msb(blockers)
+            possible &= ~rays[nearest]
+        attacks |= possible
+    return attacks
+
+
+# Occupancy masks and attacks for a line, indexed by square. See _gen_line_attacks
+LineTable = Tuple[Tuple[Bitboard, ...], Tuple[Dict[Bitboard, Bitboard], ...]]
+
+
+def _gen_line_attacks(directions: Tuple[Direction, Direction]) -> LineTable:
+    """
+    Precomputes attacks along a line (a pair of opposing rays) for every square and every possible arrangement of
+    blockers on it. Blockers on the board edge never change the attacks, so they are left out of the occupancy mask.
+    Attacks are then looked up with `attacks[sq][occupied & masks[sq]]`.
+    """
+    masks = []
+    attacks = []
+    for sq in SQUARES:
+        mask = (BB_RAYS[directions[0]][sq] | BB_RAYS[directions[1]][sq]) & ~_edges(sq)
+        line_attacks = {}
+        subset = BB_EMPTY
+        while True:  # Iterate over every subset of the mask
+            line_attacks[subset] = _slide_attacks(sq, subset, directions)
+            subset = (subset - mask) & mask
+            if not subset:
+                break
+        masks.append(mask)
+        attacks.append(line_attacks)
+    return tuple(masks), tuple(attacks)
+
+
+BB_RANK_MASKS, BB_RANK_ATTACKS = _gen_line_attacks((EAST, WEST))
+BB_FILE_MASKS, BB_FILE_ATTACKS = _gen_line_attacks((NORTH, SOUTH))
+BB_DIAG_MASKS, BB_DIAG_ATTACKS = _gen_line_attacks((NORTHEAST, SOUTHWEST))
+BB_ANTI_DIAG_MASKS, BB_ANTI_DIAG_ATTACKS = _gen_line_attacks((NORTHWEST, SOUTHEAST))
+
+
+def _combine_line_attacks(first: LineTable, second: LineTable) -> LineTable:
+    """
+    Merges the tables of two lines crossing at each square, so that attacks along both need a single lookup. Every
+    pairing of an occupancy on the first line with one on the second gives a distinct key, as the masks don't overlap.
+    """
+    masks = []
+    attacks = []
+    for sq in SQUARES:
+        combined = {}
+        for occupied_1, attacks_1 in first[1][sq].items():
+            for occupied_2, attacks_2 in second[1][sq].items():
+                combined[occupied_1 | occupied_2] = attacks_1 | attacks_2
+        masks.append(first[0][sq] | second[0][sq])
+        attacks.append(combined)
+    return tuple(masks), tuple(attacks)
+
+
+BB_ROOK_MASKS, BB_ROOK_ATTACKS = _combine_line_attacks(
+    (BB_RANK_MASKS, BB_RANK_ATTACKS), (BB_FILE_MASKS, BB_FILE_ATTACKS),
+)
+BB_BISHOP_MASKS, BB_BISHOP_ATTACKS = _combine_line_attacks(
+    (BB_DIAG_MASKS, BB_DIAG_ATTACKS), (BB_ANTI_DIAG_MASKS, BB_ANTI_DIAG_ATTACKS),
+)
+
+# Line attack tables grouped by the pieces that slide along them
+BB_CARDINAL_LINES = ((BB_ROOK_MASKS, BB_ROOK_ATTACKS),)
+BB_DIAGONAL_LINES = ((BB_BISHOP_MASKS, BB_BISHOP_ATTACKS),)
+BB_ALL_LINES = BB_CARDINAL_LINES + BB_DIAGONAL_LINES
+
+BB_CARDINALS = tuple(
     BB_RAYS[NORTH][i] | BB_RAYS[EAST][i] | BB_RAYS[SOUTH][i] | BB_RAYS[WEST][i]
     for i in range(64)
-]
+)
 
-BB_DIAGONALS = [
+BB_DIAGONALS = tuple(
     BB_RAYS[NORTHEAST][i] | BB_RAYS[SOUTHEAST][i] | BB_RAYS[SOUTHWEST][i] | BB_RAYS[NORTHWEST][i]
     for i in range(64)
-]
-
-BB_BETWEEN = []  # type: List[List[int]]
+)
 
 
 def _calc_between(rays, _from_sq, _to_sq):
-    possible = rays[_from_sq]
-    blockers = possible & BB_SQUARES[_to_sq]
-    blocked_paths = rays[lsb(blockers)] | rays[msb(blockers)]
-    return (possible & ~blocked_paths) ^ BB_SQUARES[_to_sq]
+    # The ray continuing on past the target square is the part of the ray from the first square that isn't between
+    return rays[_from_sq] & ~rays[_to_sq] & ~BB_SQUARES[_to_sq]
 
 
-for _from_sq in SQUARES:
-    BB_BETWEEN.append([])
-    for _to_sq in SQUARES:
-        bb_to_sq = BB_SQUARES[_to_sq]
+def _between(_from_sq, _to_sq):
+    bb_to_sq = BB_SQUARES[_to_sq]
+    for _direction in BB_RAYS:
+        if BB_RAYS[_direction][_from_sq] & bb_to_sq:  # Only one ray from a square can reach another
+            return _calc_between(BB_RAYS[_direction], _from_sq, _to_sq)
+    return BB_EMPTY
 
-        between = None
-        for _direction in BB_RAYS:
-            if BB_RAYS[_direction][_from_sq] & bb_to_sq:
-                between = _calc_between(BB_RAYS[_direction], _from_sq, _to_sq)
-                continue
 
-        if between:
-            BB_BETWEEN[_from_sq].append(between)
-        else:
-            BB_BETWEEN[_from_sq].append(BB_EMPTY)
+# Squares strictly between two squares sharing a line, indexed by from_sq * 64 + to_sq. Flat, like SQUARE_DISTANCE, so
+# a lookup is a single subscript
+BB_BETWEEN = tuple(_between(_from_sq, _to_sq) for _from_sq in SQUARES for _to_sq in SQUARES)
+
+
+def _calc_line(_from_sq, _to_sq):
+    """Whole rank, file or diagonal running through both squares, edge to edge."""
+    bb_to_sq = BB_SQUARES[_to_sq]
+    for _direction, _opposite in ((NORTH, SOUTH), (EAST, WEST), (NORTHEAST, SOUTHWEST), (NORTHWEST, SOUTHEAST)):
+        line = BB_RAYS[_direction][_from_sq] | BB_RAYS[_opposite][_from_sq]
+        if line & bb_to_sq:
+            return line | BB_SQUARES[_from_sq]
+    return BB_EMPTY
+
 
+# Indexed by two squares, empty if they don't share a line
+BB_LINE = tuple(tuple(_calc_line(_from_sq, _to_sq) for _to_sq in SQUARES) for _from_sq in SQUARES)
@@ -1,9 +1,9 @@
-from typing import Dict, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 
-import log
 from game.bitboard import *
-from game.move import Move
+from game.move import Move, PACKED_CASTLING, PACKED_PROMOTION_FLAGS
 from game.piece import Piece
+from game.zobrist import ZOBRIST_PIECES, ZOBRIST_CASTLING, ZOBRIST_EN_PASSANT, ZOBRIST_WHITE_TURN
 from game.exceptions import (
     Checkmate,
     Stalemate,
@@ -27,30 +27,25 @@ from game.constants import (
     QUEEN,
     KING,
     PIECE_TYPES,
+    PIECE_SYMBOL_TYPES,
+    PIECE_CODES,
     PIECE_VALUES,
-
-    Direction,
-    NORTH,
-    NORTHEAST,
-    EAST,
-    SOUTHEAST,
-    SOUTH,
-    SOUTHWEST,
-    WEST,
-    NORTHWEST,
 )
 from game.square import (
-    PAWN_POSITION_VALUES,
-    ROOK_POSITION_VALUES,
-    KNIGHT_POSITION_VALUES,
-    BISHOP_POSITION_VALUES,
-    QUEEN_POSITION_VALUES,
+    PIECE_SQUARE_VALUES,
     KING_POSITION_VALUES,
     KING_LATE_GAME_POSITION_VALUES,
 )
 
 
 class Board:
+    __slots__ = (
+        'turn', 'en_passant_sq', 'halfmove_clock', 'fullmoves', 'track_repetitions', 'repetitions', 'move_history',
+        '_history', 'pawns', 'knights', 'bishops', 'rooks', 'queens', 'kings', 'occupied', 'occupied_colour',
+        'piece_types', 'piece_bitboards', 'castling_rights', 'piece_square_value', '_legal_moves', '_in_check',
+        '_pieces', 'piece_hash',
+    )
+
     def __init__(self, fen: str = STARTING_STATE, track_repetitions: bool = False):
         """
         Represents the chess game and game state as a bitboard.
@@ -77,52 +72,84 @@ class Board:
 
     @property
     def _bb_en_passant(self):
-        return BB_SQUARES[self.en_passant_sq] if self.en_passant_sq else BB_EMPTY
+        return 1 << self.en_passant_sq if self.en_passant_sq else BB_EMPTY
 
     @property
     def _short_fen(self):
-        return ' '.join(self.fen.split(' ')[:4])
+        """FEN without the move clocks, i.e. just the position."""
+        piece_types = self.piece_types
+        white = self.occupied_colour[WHITE]
+        ranks = []
+        for rank_start in range(56, -1, -8):  # FEN starts from the 8th rank
+            rank_str = []
+            blank_counter = 0
+            for sq in range(rank_start, rank_start + 8):
+                piece_type = piece_types[sq]
+                if piece_type:  # Read the mailbox directly rather than building a Piece for each square
+                    if blank_counter > 0:
+                        rank_str.append(str(blank_counter))
+                        blank_counter = 0
+                    rank_str.append(PIECE_CODES[(white >> sq) & 1][piece_type])
+                else:
+                    blank_counter += 1
+            if blank_counter > 0:
+                rank_str.append(str(blank_counter))
+            ranks.append(''.join(rank_str))
+
+        _turn = 'w' if self.turn == WHITE else 'b'
+        _en_passant = '-' if not self.en_passant_sq else SQUARE_NAMES[self.en_passant_sq]
+        return f'{"/".join(ranks)} {_turn} {self.castle_flags} {_en_passant}'
+
+    @property
+    def zobrist_hash(self) -> int:
+        """
+        64-bit Zobrist hash of the position, i.e. pieces, turn, castling rights and en passant square. Used as the key
+        for repetitions.
+        """
+        # The pieces are hashed incrementally, see Board.place_piece and Board.remove_piece
+        _hash = self.piece_hash ^ ZOBRIST_WHITE_TURN if self.turn == WHITE else self.piece_hash
+        for sq in bitboard_to_squares(self.castling_rights[WHITE] | self.castling_rights[BLACK]):
+            _hash ^= ZOBRIST_CASTLING[sq]
+        if self.en_passant_sq:
+            _hash ^= ZOBRIST_EN_PASSANT[self.en_passant_sq & 7]
+        return _hash
 
     def _save(self):
         self._history.append(_BoardState(self))
 
     def _clear(self):
         """Defines an empty bitbaord."""
-        self.pawns = {
-            WHITE: BB_EMPTY,
-            BLACK: BB_EMPTY,
-        }
-        self.knights = {
-            WHITE: BB_EMPTY,
-            BLACK: BB_EMPTY,
-        }
-        self.bishops = {
-            WHITE: BB_EMPTY,
-            BLACK: BB_EMPTY,
-        }
-        self.rooks = {
-            WHITE: BB_EMPTY,
-            BLACK: BB_EMPTY,
-        }
-        self.queens = {
-            WHITE: BB_EMPTY,
-            BLACK: BB_EMPTY,
-        }
-        self.kings = {
-            WHITE: BB_EMPTY,
-            BLACK: BB_EMPTY,
+        # Bitboards per colour are lists indexed directly by colour, i.e. BLACK (False) at 0 and WHITE (True) at 1
+        self.pawns = [BB_EMPTY, BB_EMPTY]
+        self.knights = [BB_EMPTY, BB_EMPTY]
+        self.bishops = [BB_EMPTY, BB_EMPTY]
+        self.rooks = [BB_EMPTY, BB_EMPTY]
+        self.queens = [BB_EMPTY, BB_EMPTY]
+        self.kings = [BB_EMPTY, BB_EMPTY]
+
+        # The same per-colour lists, indexed by piece type so that placing or removing a piece is a single lookup
+        self.piece_bitboards = (None, self.pawns, self.rooks, self.knights, self.bishops, self.queens, self.kings)
+        self._pieces = {
+            PAWN: self.pawns,
+            ROOK: self.rooks,
+            KNIGHT: self.knights,
+            BISHOP: self.bishops,
+            QUEEN: self.queens,
+            KING: self.kings,
         }
 
         self.occupied = BB_EMPTY
-        self.occupied_colour = {
-            WHITE: BB_EMPTY,
-            BLACK: BB_EMPTY,
-        }
+        self.piece_types = [None] * 64  # type: List[Optional[PieceType]]
+        self.occupied_colour = [BB_EMPTY, BB_EMPTY]
+        self.piece_square_value = 0  # Sum of PIECE_SQUARE_VALUES, kept up to date as pieces are placed and removed
+        self.piece_hash = 0  # Zobrist keys of every piece XORed together, also kept up to date
 
-        self.castling_rights = {  # Should call self._update_castling_rights
-            WHITE: BB_ORIGINAL_ROOKS[WHITE],
-            BLACK: BB_ORIGINAL_ROOKS[BLACK],
-        }
+        # Cached for the current position, reset whenever a piece is placed or removed or a move is undone
+        self._legal_moves = None  # type: Optional[Tuple[Move, ...]]
+        self._in_check = None  # type: Optional[bool]
+
+        # Should call self._update_castling_rights
+        self.castling_rights = [BB_ORIGINAL_ROOKS[BLACK], BB_ORIGINAL_ROOKS[WHITE]]
 
         self.turn = WHITE
         self.en_passant_sq = None
@@ -141,22 +168,24 @@ class Board:
                 rank -= 1
                 file = 0
             else:
-                assert char.lower() in PIECE_TYPES, f'{char} is not a valid piece in FEN notation.'
+                if char.lower() not in PIECE_SYMBOL_TYPES:
+                    raise ValueError(f'{char} is not a valid piece in FEN notation.')
                 self.place_piece(
-                    Square.from_file_rank(file, rank),
-                    char.lower(),
+                    file_rank_to_index(file, rank),
+                    PIECE_SYMBOL_TYPES[char.lower()],
                     WHITE if char.isupper() else BLACK,
                 )
                 file += 1
 
         if len(components) > 1:
             turn = components[1].lower()
-            assert turn in ['w', 'b'], "Invalid FEN."
+            if turn not in ('w', 'b'):
+                raise ValueError("Invalid FEN.")
             self.turn = BLACK if turn == 'b' else WHITE
 
         if len(components) > 3:
             _en_passant_coord = components[3].upper()
-            self.en_passant_sq = None if _en_passant_coord == '-' else Square.from_coord(_en_passant_coord)
+            self.en_passant_sq = None if _en_passant_coord == '-' else square_from_coord(_en_passant_coord)
 
         if len(components) > 4:
             self.halfmove_clock = int(components[4])
@@ -167,19 +196,21 @@ class Board:
         self._update_castling_rights()  # Cache castling rights
 
     def _attack_rays_from_square(
-            self, square: Square, directions: Iterable[Direction], ignore: Bitboard = BB_EMPTY,
+            self, square: Square, line_tables: Iterable[LineTable], ignore: Bitboard = BB_EMPTY,
     ) -> Bitboard:
-        moves = BB_EMPTY
+        """
+        Returns the squares attacked along the given lines, stopping at (and including) the first blocker of each ray.
 
-        for direction in directions:
-            possible = BB_RAYS[direction][square]
-            blockers = (possible & self.occupied) & ~ignore
+        Args:
+            square: Square the rays originate from.
+            line_tables: Mask and attack tables for each line to slide along, e.g. BB_CARDINAL_LINES for a rook.
+            ignore: Pieces in this mask do not block the rays.
+        """
+        moves = BB_EMPTY
+        occupied = self.occupied & ~ignore
 
-            if blockers:
-                blocked_paths = BB_RAYS[direction][lsb(blockers)] | BB_RAYS[direction][msb(blockers)]
-            else:
-                blocked_paths = BB_EMPTY
-            moves |= possible & ~blocked_paths
+        for masks, attacks in line_tables:
+            moves |= attacks[square][occupied & masks[square]]
         return moves
 
     def _moves_from_square(
@@ -191,39 +222,36 @@ class Board:
             else:
                 return _moves & ~self.occupied_colour[colour]  # Cannot take our own pieces
 
-        bb_sq = BB_SQUARES[square]
+        piece_type = self.piece_types[square]
 
-        if self.pawns[colour] & bb_sq:
+        if piece_type == PAWN:
             moves = BB_PAWN_ATTACKS[colour][square]
 
             # If actually moving the piece, need to restrict pawn diagonal moves to captures
             if not attacks_only:
                 moves &= (self.occupied_colour[not colour] | self._bb_en_passant)
-                advances = BB_PAWN_MOVES[colour]['single'][square] & ~self.occupied  # Single move (unless occupied)
-                if advances:  # Conditionally allow a double advance
-                    advances |= BB_PAWN_MOVES[colour]['double'][square] & ~self.occupied
-                moves |= advances
+                # As in _pseudo_legal_moves, a double advance is a single advance landing on the third rank, advanced
+                # again, so a blocked single advance blocks the double without a separate check
+                empty = ~self.occupied
+                if colour == WHITE:
+                    single_push = (BB_SQUARES[square] << 8) & empty
+                    moves |= single_push | (((single_push & BB_RANK_3) << 8) & empty)
+                else:
+                    single_push = (BB_SQUARES[square] >> 8) & empty
+                    moves |= single_push | (((single_push & BB_RANK_6) >> 8) & empty)
             return moves
-        elif self.rooks[colour] & bb_sq:
-            moves = self._attack_rays_from_square(square, (NORTH, EAST, WEST, SOUTH), ignore=ignore)
+        elif piece_type == ROOK:
+            moves = self._attack_rays_from_square(square, BB_CARDINAL_LINES, ignore=ignore)
             return _filter_occupied(moves)
-        elif self.knights[colour] & bb_sq:
+        elif piece_type == KNIGHT:
             return _filter_occupied(BB_KNIGHT_MOVES[square])
-        elif self.bishops[colour] & bb_sq:
-            moves = self._attack_rays_from_square(
-                square,
-                (NORTHWEST, NORTHEAST, SOUTHWEST, SOUTHEAST),
-                ignore=ignore,
-            )
+        elif piece_type == BISHOP:
+            moves = self._attack_rays_from_square(square, BB_DIAGONAL_LINES, ignore=ignore)
             return _filter_occupied(moves)
-        elif self.queens[colour] & bb_sq:
-            moves = self._attack_rays_from_square(
-                square,
-                (NORTH, EAST, WEST, SOUTH, NORTHWEST, NORTHEAST, SOUTHWEST, SOUTHEAST),
-                ignore=ignore,
-            )
+        elif piece_type == QUEEN:
+            moves = self._attack_rays_from_square(square, BB_ALL_LINES, ignore=ignore)
             return _filter_occupied(moves)
-        elif self.kings[colour] & bb_sq:
+        elif piece_type == KING:
             return _filter_occupied(BB_KING_MOVES[square])
 
     def _attack_bitboard(self, colour: Colour, ignore: Bitboard = BB_EMPTY) -> Bitboard:
@@ -234,29 +262,33 @@ class Board:
             colour: Colour of the player attacking
             ignore: Filters out any pieces included in the mask: calculates the attack game as if they weren't there.
         """
-        attack_moves = BB_EMPTY
-        for from_square in bitboard_to_squares(self.occupied_colour[colour]):
-            moves = self._moves_from_square(from_square, colour, ignore=ignore, attacks_only=True)
-            if moves:
-                attack_moves |= moves
+        # Built per piece type rather than per square, so there is no dispatch on the piece on each square. Pawn
+        # attacks are found for all pawns at once by shifting, as in _pseudo_legal_moves
+        occupied = self.occupied & ~ignore
+        pawns = self.pawns[colour]
+        if colour == WHITE:
+            attack_moves = ((pawns & ~BB_FILE_A) << 7) | ((pawns & ~BB_FILE_H) << 9)
+        else:
+            attack_moves = ((pawns & ~BB_FILE_A) >> 9) | ((pawns & ~BB_FILE_H) >> 7)
+
+        for from_square in bitboard_to_squares(self.knights[colour]):
+            attack_moves |= BB_KNIGHT_MOVES[from_square]
+        for from_square in bitboard_to_squares(self.kings[colour]):
+            attack_moves |= BB_KING_MOVES[from_square]
+
+        queens = self.queens[colour]
+        for from_square in bitboard_to_squares(self.rooks[colour] | queens):
+            attack_moves |= BB_ROOK_ATTACKS[from_square][occupied & BB_ROOK_MASKS[from_square]]
+        for from_square in bitboard_to_squares(self.bishops[colour] | queens):
+            attack_moves |= BB_BISHOP_ATTACKS[from_square][occupied & BB_BISHOP_MASKS[from_square]]
         return attack_moves
 
-    @staticmethod
-    def _filter_blockers(attackers: Bitboard, target: Square, mask: Bitboard) -> Bitboard:
-        for attacker_sq in bitboard_to_squares(attackers):
-            if BB_BETWEEN[attacker_sq][target] & mask:
-                attackers &= ~BB_SQUARES[attacker_sq]
-        return attackers
-
-    def _attackers(
-        self, target: Square, colour,
-        filter_blockers: bool = False,
-    ) -> Bitboard:
+    def _attackers(self, target: Square, colour) -> Bitboard:
         """Returns the slide attackers of a given square."""
         cardinal_movers = self.rooks[colour] | self.queens[colour]
         diagonal_movers = self.bishops[colour] | self.queens[colour]
 
-        attackers = (
+        return (
             (BB_CARDINALS[target] & cardinal_movers) |
             (BB_DIAGONALS[target] & diagonal_movers) |
             (BB_KNIGHT_MOVES[target] & self.knights[colour]) |
@@ -265,56 +297,105 @@ class Board:
             (BB_PAWN_ATTACKS[not colour][target] & self.pawns[colour])
         )
 
-        if filter_blockers:
-            attackers = self._filter_blockers(attackers, target, filter_blockers)
-        return attackers
+    def _attacked_by(self, target: Square, colour: Colour) -> Bitboard:
+        """Returns the pieces of the given colour attacking a square, taking blocking pieces into account."""
+        occupied = self.occupied
+        queens = self.queens[colour]
+        return (
+            (BB_KNIGHT_MOVES[target] & self.knights[colour]) |
+            (BB_KING_MOVES[target] & self.kings[colour]) |
+            (BB_PAWN_ATTACKS[not colour][target] & self.pawns[colour]) |  # Reversed, as for _attackers
+            (BB_ROOK_ATTACKS[target][occupied & BB_ROOK_MASKS[target]] & (self.rooks[colour] | queens)) |
+            (BB_BISHOP_ATTACKS[target][occupied & BB_BISHOP_MASKS[target]] & (self.bishops[colour] | queens))
+        )
 
     def _protectors(self, target: Square, colour: Colour) -> Bitboard:
         """
         Returns positions of pieces of the given colour that are protecting the given square from queens, rooks and
-        bishops.
+        bishops. They can only move along BB_LINE between the square and themselves.
         """
-        attackers = self._attackers(target, not colour)
         protectors = BB_EMPTY
-        for attacker_sq in bitboard_to_squares(attackers):
-            _blocker = BB_BETWEEN[attacker_sq][target] & self.occupied
-            if _blocker and BB_SQUARES[msb(_blocker)] == _blocker:  # Check there's exactly one blocker
+        for attacker_sq in bitboard_to_squares(self._attackers(target, not colour)):
+            _blocker = BB_BETWEEN[(attacker_sq << 6) | target] & self.occupied
+            if _blocker and not _blocker & (_blocker - 1):  # Check there's exactly one blocker
                 protectors |= _blocker
         return protectors
 
-    def _pseudo_legal_moves(self, colour: Colour) -> Iterable[Move]:
-        """Generates possible moves without taking into account check and the safety of the King."""
-
-        # Generic piece moves
-        non_pawns = self.occupied_colour[colour] & ~self.pawns[colour]
-        for from_square in bitboard_to_squares(non_pawns):
-            moves = self._moves_from_square(from_square, colour)
-            if moves:
-                moves &= ~self.occupied_colour[colour]  # Cannot take our own pieces
-                for to_square in bitboard_to_squares(moves):
-                    yield Move(from_square, to_square)
+    def _pseudo_legal_moves(self, colour: Colour) -> Iterable[int]:
+        """
+        Generates possible moves without taking into account check and the safety of the King. Moves are packed into
+        ints to avoid allocating a Move for each one, see Move.from_packed.
+        """
 
-        # Handle pawns specifically so we can assign promotions to moves
+        # Each piece type has its own loop so there is no need to dispatch on the piece type of every square. Sliding
+        # moves are looked up directly, as in _attack_bitboard, rather than through Board._attack_rays_from_square
+        occupied = self.occupied
+        not_ours = ~self.occupied_colour[colour]
+
+        for from_square in bitboard_to_squares(self.knights[colour]):
+            for to_square in bitboard_to_squares(BB_KNIGHT_MOVES[from_square] & not_ours):
+                yield from_square | (to_square << 6)
+
+        for from_square in bitboard_to_squares(self.bishops[colour]):
+            moves = BB_BISHOP_ATTACKS[from_square][occupied & BB_BISHOP_MASKS[from_square]] & not_ours
+            for to_square in bitboard_to_squares(moves):
+                yield from_square | (to_square << 6)
+
+        for from_square in bitboard_to_squares(self.rooks[colour]):
+            moves = BB_ROOK_ATTACKS[from_square][occupied & BB_ROOK_MASKS[from_square]] & not_ours
+            for to_square in bitboard_to_squares(moves):
+                yield from_square | (to_square << 6)
+
+        for from_square in bitboard_to_squares(self.queens[colour]):
+            moves = (
+                BB_ROOK_ATTACKS[from_square][occupied & BB_ROOK_MASKS[from_square]] |
+                BB_BISHOP_ATTACKS[from_square][occupied & BB_BISHOP_MASKS[from_square]]
+            ) & not_ours
+            for to_square in bitboard_to_squares(moves):
+                yield from_square | (to_square << 6)
+
+        for from_square in bitboard_to_squares(self.kings[colour]):
+            for to_square in bitboard_to_squares(BB_KING_MOVES[from_square] & not_ours):
+                yield from_square | (to_square << 6)
+
+        # Pawns are handled last so we can assign promotions to moves. Rather than looking up each pawn, the targets of
+        # all of them are found at once by shifting the whole pawn bitboard, then each target is paired with the square
+        # it came from by undoing the shift. Pawns can only move diagonally to capture.
         pawns = self.pawns[colour]
-        for from_square in bitboard_to_squares(pawns):
-            moves = self._moves_from_square(from_square, colour)
-            if moves:
-                moves &= ~self.occupied_colour[colour]
-                bb_sq = BB_SQUARES[from_square]
-                for to_square in bitboard_to_squares(moves):
-                    if self.pawns[colour] & bb_sq and to_square.rank in (0, 7):  # Promotion
-                        for piece_type in (QUEEN, ROOK, BISHOP, KNIGHT):
-                            yield Move(from_square, to_square, promotion=piece_type)
-                    else:
-                        yield Move(from_square, to_square)
+        empty = ~occupied
+        captures = self.occupied_colour[not colour] | self._bb_en_passant
+        if colour == WHITE:
+            single_pushes = (pawns << 8) & empty
+            pawn_moves = (
+                (single_pushes, -8),
+                (((single_pushes & BB_RANK_3) << 8) & empty, -16),
+                (((pawns & ~BB_FILE_A) << 7) & captures, -7),
+                (((pawns & ~BB_FILE_H) << 9) & captures, -9),
+            )
+        else:
+            single_pushes = (pawns >> 8) & empty
+            pawn_moves = (
+                (single_pushes, 8),
+                (((single_pushes & BB_RANK_6) >> 8) & empty, 16),
+                (((pawns & ~BB_FILE_A) >> 9) & captures, 9),
+                (((pawns & ~BB_FILE_H) >> 7) & captures, 7),
+            )
+
+        backranks = BB_RANK_1 | BB_RANK_8
+        for targets, from_offset in pawn_moves:
+            for to_square in bitboard_to_squares(targets & ~backranks):
+                yield (to_square + from_offset) | (to_square << 6)
+            for to_square in bitboard_to_squares(targets & backranks):  # Promotion
+                for promotion in PACKED_PROMOTION_FLAGS:
+                    yield (to_square + from_offset) | (to_square << 6) | promotion
 
         # Castling moves
-        if self.castling_rights:
-            from_square = Square(msb(self.kings[colour]))  # Is a move for the King
+        if self.castling_rights[colour]:
+            from_square = self.kings[colour].bit_length() - 1  # Is a move for the King
             for rook_sq in bitboard_to_squares(self.castling_rights[colour]):
-                if not (BB_BETWEEN[from_square][rook_sq] & self.occupied):  # Check no pieces in-between
-                    castle_sq = rook_sq + 2 if rook_sq.file == 0 else rook_sq - 1
-                    yield Move(from_square, castle_sq, is_castling=True)
+                if not (BB_BETWEEN[(from_square << 6) | rook_sq] & self.occupied):  # Check no pieces in-between
+                    castle_sq = rook_sq + 2 if rook_sq & 7 == 0 else rook_sq - 1
+                    yield from_square | (castle_sq << 6) | PACKED_CASTLING
 
     def _update_castling_rights(self):
         """Sets the castling rights of the game based on the positions of the kings and rooks."""
@@ -332,10 +413,7 @@ class Board:
         if not self.kings[BLACK] & BB_E8:
             black_castling = BB_EMPTY
 
-        self.castling_rights = {
-            WHITE: white_castling,
-            BLACK: black_castling,
-        }
+        self.castling_rights = [black_castling, white_castling]
         return self.castling_rights
 
     @property
@@ -359,34 +437,7 @@ class Board:
         Returns the game's current state in FE Notation.
         (https://en.wikipedia.org/wiki/Forsyth%E2%80%93Edwards_Notation)
         """
-        fen_str = ''
-        rank = 7
-        blank_counter = 0
-        for sq in SQUARES_VFLIP:
-            if rank > sq.rank:
-                if blank_counter > 0:
-                    fen_str += str(blank_counter)
-                    blank_counter = 0
-                fen_str += '/'
-                rank = sq.rank
-
-            piece = self.piece_at(sq)
-            if piece:
-                if blank_counter > 0:
-                    fen_str += str(blank_counter)
-                    blank_counter = 0
-                fen_str += piece.code
-            else:
-                blank_counter += 1
-
-            if sq == H1 and piece is None:
-                fen_str += str(blank_counter)
-
-        _turn = 'w' if self.turn == WHITE else 'b'
-        _en_passant = '-' if not self.en_passant_sq else str(self.en_passant_sq).lower()
-        fen_str += f' {_turn} {self.castle_flags} {_en_passant} {self.halfmove_clock} {self.fullmoves}'
-
-        return fen_str
+        return f'{self._short_fen} {self.halfmove_clock} {self.fullmoves}'
 
     @property
     def all_pawns(self):
@@ -414,45 +465,48 @@ class Board:
 
     @property
     def is_in_check(self):
-        return bool(self.kings[self.turn] & self._attack_bitboard(not self.turn))
+        if self._in_check is None:
+            king = self.kings[self.turn]
+            self._in_check = bool(king) and bool(self._attacked_by(king.bit_length() - 1, not self.turn))
+        return self._in_check
+
+    @property
+    def has_legal_move(self) -> bool:
+        """
+        Whether the turn player can move at all. Uses the cached legal moves if there are any, otherwise stops
+        generating moves at the first legal one.
+        """
+        if self._legal_moves is not None:
+            return bool(self._legal_moves)
+        return any(self._generate_legal_moves())
 
     @property
     def is_checkmate(self):
-        return self.is_in_check and not any(self.legal_moves)
+        return self.is_in_check and not self.has_legal_move
 
     @property
     def is_stalemate(self):
-        return not self.is_in_check and not any(self.legal_moves)
+        return not self.is_in_check and not self.has_legal_move
 
     @property
     def has_insufficient_material(self):
-        # If the player has any pawns, rooks or queens the game can be won
-        if self.occupied & (self.all_pawns | self.all_rooks | self.all_queens):
-            return False
-
-        # If it is king vs king
-        if self.occupied == self.all_kings:
-            return True
-
-        total_pieces = bit_count(self.occupied)
+        total_pieces = popcount(self.occupied)
         if total_pieces > 4:  # Checkmate can be achieved if there are more than 4 pieces
             return False
 
-        # If it is king + knight vs king
-        if self.occupied & self.all_knights:
-            return total_pieces <= 3  # Insufficient if it is only King + Knight vs King
-        elif self.occupied & self.all_bishops:  # Player has at least one bishop
-            if total_pieces < 4:
-                return True
+        # If the player has any pawns, rooks or queens the game can be won
+        pawns, rooks, queens = self.pawns, self.rooks, self.queens
+        if pawns[WHITE] | pawns[BLACK] | rooks[WHITE] | rooks[BLACK] | queens[WHITE] | queens[BLACK]:
+            return False
 
-            # All remaining bishops are on the same colour squares
+        # Only Kings, knights and bishops are left. King + Knight vs King is insufficient, a knight with any other
+        # minor piece is not
+        if self.knights[WHITE] | self.knights[BLACK]:
+            return total_pieces <= 3
 
-            only_bishops_and_kings = self.occupied == (self.all_bishops | self.all_kings)
-            bishops_are_same_colour = (
-                    (not self.all_bishops & BB_WHITE_SQUARES) or  # No bishops on white squares
-                    (not self.all_bishops & BB_BLACK_SQUARES)  # No bishops on black squares
-            )
-            return bishops_are_same_colour and only_bishops_and_kings
+        # Also covers King vs King, and King + Bishop vs King, as all of the (zero or one) bishops share a colour
+        bishops = self.bishops[WHITE] | self.bishops[BLACK]
+        return not bishops & BB_WHITE_SQUARES or not bishops & BB_BLACK_SQUARES
 
     @property
     def has_threefold_repetition(self):
@@ -469,39 +523,30 @@ class Board:
 
     @property
     def is_game_over(self):
-        has_legal_move = any(self.legal_moves)
-
+        # Cheapest checks first, so move generation only runs if the game could still be going
         if self.halfmove_clock >= 50:  # 50 move draw
             return True
         elif self.has_insufficient_material:
             return True
-        elif not has_legal_move:  # Check/stalemate
+        elif not self.has_legal_move:  # Check/stalemate
             return True
         else:
             return False
 
+    def mobility(self, colour: Colour) -> int:
+        """Number of pseudo-legal moves (excluding castling) available to the given player."""
+        total = 0
+        for from_square in bitboard_to_squares(self.occupied_colour[colour]):
+            total += popcount(self._moves_from_square(from_square, colour))
+        return total
+
     @property
     def value(self) -> int:
         """Simple evaluation of the game, positive for white, negative for black."""
-        def _count_value(_piece_type, _pieces, _modifier):
-            return PIECE_VALUES[_piece_type] * bit_count(_pieces) * _modifier
-
         total = 0
-        for colour in (WHITE, BLACK):
-            for piece_type in (PAWN, ROOK, BISHOP, KNIGHT, QUEEN, KING):
-                modifier = 1 if colour == WHITE else -1
-                if piece_type == PAWN:
-                    total += _count_value(piece_type, self.pawns[colour], modifier)
-                elif piece_type == ROOK:
-                    total += _count_value(piece_type, self.rooks[colour], modifier)
-                elif piece_type == KNIGHT:
-                    total += _count_value(piece_type, self.knights[colour], modifier)
-                elif piece_type == BISHOP:
-                    total += _count_value(piece_type, self.bishops[colour], modifier)
-                elif piece_type == QUEEN:
-                    total += _count_value(piece_type, self.queens[colour], modifier)
-                elif piece_type == KING:
-                    total += _count_value(piece_type, self.kings[colour], modifier)
+        for piece_type in PIECE_TYPES:
+            black, white = self.piece_bitboards[piece_type]
+            total += PIECE_VALUES[piece_type] * (popcount(white) - popcount(black))
         return total
 
     @property
@@ -510,40 +555,19 @@ class Board:
         Weighted evaluation of the game, positive for white, negative for black. Adjusts piece values depending on the
         positions on the game. More expensive to calcualte than Board.value.
         """
-        total = 0
-        for colour in (WHITE, BLACK):
-            modifier = 1 if colour == WHITE else -1
-            for piece_type in (PAWN, ROOK, BISHOP, KNIGHT, QUEEN, KING):
-                if piece_type == PAWN:
-                    for sq in bitboard_to_squares(self.pawns[colour]):
-                        total += ((PIECE_VALUES[piece_type] + PAWN_POSITION_VALUES[colour][sq]) * modifier)
-                elif piece_type == ROOK:
-                    for sq in bitboard_to_squares(self.rooks[colour]):
-                        total += ((PIECE_VALUES[piece_type] + ROOK_POSITION_VALUES[colour][sq]) * modifier)
-                elif piece_type == KNIGHT:
-                    for sq in bitboard_to_squares(self.knights[colour]):
-                        total += ((PIECE_VALUES[piece_type] + KNIGHT_POSITION_VALUES[colour][sq]) * modifier)
-                elif piece_type == BISHOP:
-                    for sq in bitboard_to_squares(self.bishops[colour]):
-                        total += ((PIECE_VALUES[piece_type] + BISHOP_POSITION_VALUES[colour][sq]) * modifier)
-                elif piece_type == QUEEN:
-                    for sq in bitboard_to_squares(self.queens[colour]):
-                        total += ((PIECE_VALUES[piece_type] + QUEEN_POSITION_VALUES[colour][sq]) * modifier)
-                elif piece_type == KING:
-                    if (
-                        not (self.queens[WHITE] | self.queens[BLACK]) or
-                        bit_count(
-                            self.queens[WHITE] | self.queens[BLACK] |
-                            self.rooks[WHITE] | self.rooks[BLACK] |
-                            self.bishops[WHITE] | self.bishops[BLACK] |
-                            self.knights[WHITE] | self.knights[BLACK]
-                        ) <= 4
-                    ):
-                        pos_values = KING_POSITION_VALUES
-                    else:
-                        pos_values = KING_LATE_GAME_POSITION_VALUES
-                    for sq in bitboard_to_squares(self.kings[colour]):
-                        total += ((PIECE_VALUES[piece_type] + pos_values[colour][sq]) * modifier)
+        # Everything bar the King's position is tracked incrementally, see Board.place_piece and Board.remove_piece
+        total = self.piece_square_value
+        black_kings, white_kings = self.kings
+        # Queens, rooks, bishops and knights are whatever is left once pawns and kings are removed
+        minor_and_major = self.occupied & ~(self.pawns[WHITE] | self.pawns[BLACK] | white_kings | black_kings)
+        if not (self.queens[WHITE] | self.queens[BLACK]) or popcount(minor_and_major) <= 4:
+            pos_values = KING_POSITION_VALUES
+        else:
+            pos_values = KING_LATE_GAME_POSITION_VALUES
+        if white_kings:
+            total += pos_values[WHITE][white_kings.bit_length() - 1]
+        if black_kings:
+            total -= pos_values[BLACK][black_kings.bit_length() - 1]
         return total
 
     @property
@@ -553,71 +577,99 @@ class Board:
         return modifier * self.value
 
     @property
-    def legal_moves(self) -> Iterable[Move]:
-        """Yields legal moves for the turn player."""
+    def legal_moves(self) -> Tuple[Move, ...]:
+        """
+        Legal moves for the turn player. Generated once per position and cached, as the game over checks and
+        Board.make_safe_move would otherwise each generate them again.
+        """
+        if self._legal_moves is None:
+            self._legal_moves = tuple(self._generate_legal_moves())
+        return self._legal_moves
 
-        def _is_safe(_attackers, _king_pos, _move):
-            _num_attackers = bit_count(_attackers)
-            if _num_attackers > 1:
-                return False
-            elif bit_count(_attackers) == 1:
-                _attacker_sq = list(bitboard_to_squares(_attackers))[0]
-                if not (  # Deem illegal unless the move is one of these two caveats:
-                    BB_BETWEEN[_attacker_sq][_king_pos] & BB_SQUARES[_move.to_square] or  # Piece blocks danger
-                    _move.to_square == _attacker_sq  # Piece takes attacker
-                ):
-                    return False
-            return True
+    def _generate_legal_moves(self) -> Iterable[Move]:
+        """Yields legal moves for the turn player."""
 
-        king = self.kings[self.turn]
-        king_pos = Square(msb(king))
-        protectors = self._protectors(king_pos, self.turn)
-        attacks = self._attack_bitboard(not self.turn, ignore=king)  # Pretend the King isn't there
+        turn = self.turn
+        king = self.kings[turn]
+        king_pos = king.bit_length() - 1  # msb, inlined as this runs for every node searched
+        protectors = self._protectors(king_pos, turn)
+        attacks = self._attack_bitboard(not turn, ignore=king)  # Pretend the King isn't there
         in_check = king & attacks
-        for move in self._pseudo_legal_moves(self.turn):
+        self._in_check = bool(in_check)
+        if in_check:
+            # Other pieces must take the checking piece or block it, which is impossible if there are two of them
+            checkers = self._attacked_by(king_pos, not turn)
+            if checkers & (checkers - 1):
+                evasions = BB_EMPTY
+            else:
+                evasions = BB_BETWEEN[((checkers.bit_length() - 1) << 6) | king_pos] | checkers
+
+        for move in self._pseudo_legal_moves(turn):
+            from_square = move & 63
+            to_bb = 1 << ((move >> 6) & 63)
+
             # If we are moving the king we should be careful
-            if move.from_square == king_pos:
-                if attacks & BB_SQUARES[move.to_square]:  # New position is under attack
+            if from_square == king_pos:
+                if attacks & to_bb:  # New position is under attack
                     continue
 
-                if move.is_castling:
+                if move & PACKED_CASTLING:
                     if in_check:  # Cannot castle whilst in check
                         continue
-                    elif (attacks & BB_BETWEEN[move.from_square][move.to_square]) > BB_EMPTY:
+                    elif attacks & BB_BETWEEN[(from_square << 6) | ((move >> 6) & 63)]:
                         continue  # Cannot castle if intermediate squares are under attack
+            else:
+                # If in check and we are not moving the king, we must protect it
+                if in_check and not to_bb & evasions:
+                    continue
 
-            # Cannot move this piece, it's protecting the King
-            if protectors & BB_SQUARES[move.from_square]:
-                all_attackers = self._attackers(king_pos, not self.turn)
-                protected_attacker = self._attackers(
-                    king_pos, not self.turn, filter_blockers=BB_SQUARES[move.from_square],
-                )
-                if not _is_safe(protected_attacker ^ all_attackers, king_pos, move):
+                # Cannot move this piece off the line it's protecting the King along
+                if protectors & (1 << from_square) and not to_bb & BB_LINE[king_pos][from_square]:
                     continue
 
-            # If in check and we are not moving the king, we must protect it
-            if in_check:
-                if move.from_square != king_pos:
-                    attackers = self._attackers(king_pos, not self.turn, filter_blockers=self.occupied)
-                    if not _is_safe(attackers, king_pos, move):
-                        continue
+            yield Move.from_packed(move)
 
-            yield move
+    @property
+    def ordered_legal_moves(self) -> List[Move]:
+        """
+        Legal moves for the turn player with captures first, ordered by most valuable victim and then least valuable
+        attacker (MVV-LVA). Searching likely good moves first lets alpha-beta pruning cut off more of the tree.
+        """
+        return self.ordered_moves()
+
+    def ordered_moves(self, captures_only: bool = False) -> List[Move]:
+        """
+        Legal moves for the turn player ordered as in Board.ordered_legal_moves.
+
+        Args:
+            captures_only: If specified as True, leaves out the quiet moves, e.g. for a quiescence search.
+        """
+        captures = []
+        quiet_moves = []
+        piece_types = self.piece_types
+        en_passant_sq = self.en_passant_sq
+        for move in self.legal_moves:
+            to_square = move.to_square
+            attacker = piece_types[move.from_square]
+            victim = piece_types[to_square]
+            if not victim and to_square == en_passant_sq and attacker == PAWN:
+                victim = PAWN  # En passant, the captured pawn isn't on the target square
+            if victim:
+                captures.append((PIECE_VALUES[victim] * 10 - PIECE_VALUES[attacker], move))
+            elif not captures_only:
+                quiet_moves.append(move)
+
+        captures.sort(key=lambda capture: capture[0], reverse=True)
+        return [move for _, move in captures] + quiet_moves
 
     @property
     def turn_name(self) -> str:
         return 'white' if self.turn else 'black'
 
     @property
-    def pieces(self) -> Dict[PieceType, Dict[str, int]]:
-        return {
-            PAWN: self.pawns,
-            ROOK: self.rooks,
-            KNIGHT: self.knights,
-            BISHOP: self.bishops,
-            QUEEN: self.queens,
-            KING: self.kings,
-        }
+    def pieces(self) -> Dict[PieceType, List[Bitboard]]:
+        # Built once in Board._clear, the per-colour lists it holds are only ever updated in place
+        return self._pieces
 
     @property
     def pgn_uci(self) -> str:
@@ -627,8 +679,8 @@ class Board:
         """
         pgn = ''
         for i, move in enumerate(self.move_history):
-            if i % 2 == 0:
-                pgn += f'{int(i / 2) + 1}. '
+            if not i & 1:  # White's move
+                pgn += f'{(i >> 1) + 1}. '
             pgn += f'{index_to_coord(move.from_square).lower()}{index_to_coord(move.to_square).lower()} '
         return pgn
 
@@ -639,6 +691,10 @@ class Board:
         if isinstance(move, str):
             move = Move.from_uci(move)
 
+        # Promote to a Queen if a pawn reaches the back rank without a promotion being given
+        if move.promotion is None and move.to_square >> 3 in (0, 7) and self.pawns[self.turn] & (1 << move.from_square):
+            move = Move(move.from_square, move.to_square, promotion=QUEEN)
+
         if move in self.legal_moves:
             self.make_move(move)
         else:
@@ -653,108 +709,95 @@ class Board:
         if isinstance(move, str):
             move = Move.from_uci(move)
 
-        self._save()
-        piece = self.piece_at(move.from_square)
-        captured_piece = self.piece_at(move.to_square)
+        from_square = move.from_square
+        to_square = move.to_square
+        colour = self.turn
+        piece_type = self.piece_types[from_square]
+        captured_piece_type = self.piece_types[to_square]
 
-        if not piece:
-            raise IllegalMove(f"No piece at {move.from_square}")
+        if piece_type is None:
+            raise IllegalMove(f"No piece at {square_name(from_square)}")
 
-        if piece.colour != self.turn:
+        if not self.occupied_colour[colour] & (1 << from_square):
             raise IllegalMove(f"Can't move that piece, it's not your turn.")
 
-        backrank = 7 if self.turn == WHITE else 0
+        self._save()
+
+        backrank = 7 if colour == WHITE else 0
 
         # Castling if a king is moving more than 1 square
-        if piece.type == KING and abs(move.from_square.file - move.to_square.file) > 1:
+        if piece_type == KING and abs(to_square - from_square) == 2:
             # Move King
-            self.remove_piece(move.from_square)
-            self.place_piece(move.to_square, piece.type, piece.colour)
+            self.remove_piece(from_square)
+            self.place_piece(to_square, piece_type, colour)
 
-            # Move Rook
-            rook_shift = 1 if move.to_square.file < move.from_square.file else -1  # For Queen/Kingside
-            if rook_shift > 0:  # Queenside
-                self.remove_piece(Square.from_file_rank(0, move.to_square.rank))
+            # Move Rook from the corner to the square the King passed over
+            if to_square < from_square:  # Queenside
+                self.remove_piece(to_square & ~7)
             else:
-                self.remove_piece(Square.from_file_rank(7, move.to_square.rank))
+                self.remove_piece(to_square | 7)
 
-            self.place_piece(
-                Square.from_file_rank(move.to_square.file + rook_shift, move.from_square.rank),
-                ROOK,
-                piece.colour,
-            )
+            self.place_piece((from_square + to_square) >> 1, ROOK, colour)
 
             self.repetitions = []  # Reset repetitions when castling
-        elif piece.type == PAWN and move.to_square == self.en_passant_sq:  # Take piece by en_passant
-            shift = -8 if piece.colour == WHITE else 8
-            capture_sq = self.en_passant_sq + shift
-            captured_piece = self.remove_piece(capture_sq)
-            self.remove_piece(move.from_square)
-            self.place_piece(move.to_square, piece.type, piece.colour)
-        elif piece.type == PAWN and move.to_square.rank == backrank:  # Promotion
-            self.remove_piece(move.from_square)
-            self.place_piece(move.to_square, move.promotion, piece.colour)  # Assume queen for now
+        elif piece_type == PAWN and to_square == self.en_passant_sq:  # Take piece by en_passant
+            # The captured pawn is on the from rank, directly behind the En Passant square
+            self.remove_piece((from_square & ~7) | (to_square & 7))
+            captured_piece_type = PAWN
+            self.remove_piece(from_square)
+            self.place_piece(to_square, piece_type, colour)
+        elif piece_type == PAWN and to_square >> 3 == backrank:  # Promotion
+            self.remove_piece(from_square)
+            self.place_piece(to_square, move.promotion, colour)
         else:
             # Regular piece move
-            self.remove_piece(move.from_square)
-            self.place_piece(move.to_square, piece.type, piece.colour)
-
-        # Set En Passant square
-        if piece.type == PAWN:
-            distance = move.to_square.rank - move.from_square.rank
-            if abs(distance) == 2:
-                if distance > 0:  # White pawn goes from low rank to higher
-                    self.en_passant_sq = Square(move.from_square + 8)  # En Passant square is 1 rank behind
-                else:  # Black pawn
-                    self.en_passant_sq = Square(move.from_square - 8)
-            else:
-                self.en_passant_sq = None
+            self.remove_piece(from_square)
+            self.place_piece(to_square, piece_type, colour)
+
+        # Set En Passant square, 1 rank behind a pawn that moved 2 squares
+        if piece_type == PAWN and abs(to_square - from_square) == 16:
+            self.en_passant_sq = (from_square + to_square) >> 1
         else:
             self.en_passant_sq = None
 
         # Update castling rights if the king or rook move
-        if piece.type in (KING, ROOK):
+        if piece_type == KING or piece_type == ROOK:
             self._update_castling_rights()
 
         # Reset halfmove clock if a pawn moved or a piece was captured
-        if piece.type == PAWN or captured_piece:
+        if piece_type == PAWN or captured_piece_type:
             self.halfmove_clock = 0
             self.repetitions = []
         else:
             self.halfmove_clock += 1
             if self.track_repetitions:
-                self.repetitions.append(self._short_fen)  # Imperfect repetition tracking
+                self.repetitions.append(self.zobrist_hash)  # Imperfect repetition tracking
 
-        if self.turn == BLACK:  # Increment full moves after Black's turn
+        if colour == BLACK:  # Increment full moves after Black's turn
             self.fullmoves += 1
 
         self.move_history.append(move)
-        self.turn = not self.turn
+        self.turn = not colour
 
     def unmake_move(self):
         """Reverses the previous move."""
         state = self._history.pop()
         state.load(self)
+        self.move_history.pop()
+        self._legal_moves = None
+        self._in_check = None
 
     def place_piece(self, square: Square, piece_type: PieceType, colour: Colour):
         """Place a piece of a given colour on a square of the game."""
         self.remove_piece(square)  # Remove the existing piece if it exists
-
-        mask = BB_SQUARES[square]
-
-        if piece_type.lower() == PAWN:
-            self.pawns[colour] |= mask
-        elif piece_type.lower() == ROOK:
-            self.rooks[colour] |= mask
-        elif piece_type.lower() == KNIGHT:
-            self.knights[colour] |= mask
-        elif piece_type.lower() == BISHOP:
-            self.bishops[colour] |= mask
-        elif piece_type.lower() == QUEEN:
-            self.queens[colour] |= mask
-        elif piece_type.lower() == KING:
-            self.kings[colour] |= mask
-
+        self._legal_moves = None
+        self._in_check = None
+
+        mask = 1 << square
+        self.piece_bitboards[piece_type][colour] |= mask
+        self.piece_types[square] = piece_type
+        self.piece_square_value += PIECE_SQUARE_VALUES[piece_type][colour][square]
+        self.piece_hash ^= ZOBRIST_PIECES[piece_type][colour][square]
         self.occupied |= mask
         self.occupied_colour[colour] |= mask
 
@@ -765,50 +808,33 @@ class Board:
         Returns:
             Returns the piece that existed at the square, if applicable.
         """
-        piece = self.piece_at(square)
-        if not piece:
+        piece_type = self.piece_types[square]
+        if piece_type is None:
             return None
 
-        mask = BB_SQUARES[square]
-
-        if piece.type == PAWN:
-            self.pawns[piece.colour] ^= mask
-        elif piece.type == ROOK:
-            self.rooks[piece.colour] ^= mask
-        elif piece.type == KNIGHT:
-            self.knights[piece.colour] ^= mask
-        elif piece.type == BISHOP:
-            self.bishops[piece.colour] ^= mask
-        elif piece.type == QUEEN:
-            self.queens[piece.colour] ^= mask
-        elif piece.type == KING:
-            self.kings[piece.colour] ^= mask
+        self._legal_moves = None
+        self._in_check = None
+        mask = 1 << square
+        colour = WHITE if self.occupied_colour[WHITE] & mask else BLACK
 
+        self.piece_bitboards[piece_type][colour] ^= mask
+        self.piece_types[square] = None
+        self.piece_square_value -= PIECE_SQUARE_VALUES[piece_type][colour][square]
+        self.piece_hash ^= ZOBRIST_PIECES[piece_type][colour][square]
         self.occupied ^= mask
-        self.occupied_colour[piece.colour] ^= mask
+        self.occupied_colour[colour] ^= mask
 
-        return piece
+        return Piece(piece_type, colour)
 
     def piece_at(self, square: Square) -> Optional[Piece]:
         """Optionally returns the piece occupying the given square."""
-        mask = BB_SQUARES[square]
+        piece_type = self.piece_types[square]
 
-        if not self.occupied & mask:
+        if piece_type is None:
             return None
 
-        for colour in [WHITE, BLACK]:
-            if self.pawns[colour] & mask:
-                return Piece(PAWN, colour)
-            elif self.rooks[colour] & mask:
-                return Piece(ROOK, colour)
-            elif self.knights[colour] & mask:
-                return Piece(KNIGHT, colour)
-            elif self.bishops[colour] & mask:
-                return Piece(BISHOP, colour)
-            elif self.queens[colour] & mask:
-                return Piece(QUEEN, colour)
-            elif self.kings[colour] & mask:
-                return Piece(KING, colour)
+        colour = WHITE if self.occupied_colour[WHITE] & (1 << square) else BLACK
+        return Piece(piece_type, colour)
 
     def raise_if_game_over(self):
         """Raises an exception if the game is in an end state."""
@@ -818,27 +844,22 @@ class Board:
             raise InsufficientMaterial
         elif self.has_threefold_repetition:
             raise ThreefoldRepetition
-        elif self.is_checkmate:
-            raise Checkmate
-        elif self.is_stalemate:
+        elif not self.has_legal_move:  # Only generate moves once for both checkmate and stalemate
+            if self.is_in_check:
+                raise Checkmate
             raise Stalemate
 
     def __str__(self):
         """Board representation using Unicode piece characters."""
-        board_str = ''
-        rank = 8
-        for sq in SQUARES_VFLIP:
-            if rank > sq.rank:
-                board_str += f'\n{sq.rank + 1} '
-                rank = sq.rank
-
-            piece = self.piece_at(sq)
-            if piece:
-                board_str += f'[{piece.icon}]'
-            else:
-                board_str += '[ ]'
-        board_str += '\n   A  B  C  D  E  F  G  H '
-        return board_str
+        lines = ['']
+        for rank in range(7, -1, -1):
+            squares = []
+            for sq in range(rank * 8, rank * 8 + 8):
+                piece = self.piece_at(sq)
+                squares.append(f'[{piece.icon}]' if piece else '[ ]')
+            lines.append(f'{rank + 1} ' + ''.join(squares))
+        lines.append('   A  B  C  D  E  F  G  H ')
+        return '\n'.join(lines)
 
     # Aliases for benchmarking
     push = make_move
@@ -847,13 +868,24 @@ class Board:
 
 class _BoardState:
     """Storage of bitboard integers representing state. Very cheap to copy, even if a bit ugly."""
+    __slots__ = (
+        'turn', 'en_passant_sq', 'halfmove_clock', 'fullmoves', 'repetitions', 'repetitions_count',
+        'b_pawns', 'w_pawns', 'b_rooks', 'w_rooks', 'b_knights', 'w_knights', 'b_bishops', 'w_bishops',
+        'b_queens', 'w_queens', 'b_kings', 'w_kings', 'occupied', 'piece_types', 'occupied_colour_w',
+        'occupied_colour_b', 'castling_rights', 'piece_square_value',
+        'piece_hash',
+    )
+
     def __init__(self, board: Board):
         self.turn = board.turn
         self.en_passant_sq = board.en_passant_sq
         self.halfmove_clock = board.halfmove_clock
         self.fullmoves = board.fullmoves
-        self.repetitions = tuple(board.repetitions)
-        self.move_history = tuple(board.move_history)
+
+        # Moves only ever append to the repetitions list (or replace it), so storing it and its current length is enough
+        # to restore it. The move history is popped by Board.unmake_move.
+        self.repetitions = board.repetitions
+        self.repetitions_count = len(board.repetitions)
 
         self.b_pawns = board.pawns[BLACK]
         self.w_pawns = board.pawns[WHITE]
@@ -869,17 +901,20 @@ class _BoardState:
         self.w_kings = board.kings[WHITE]
 
         self.occupied = board.occupied
+        self.piece_types = board.piece_types[:]
         self.occupied_colour_w = board.occupied_colour[WHITE]
         self.occupied_colour_b = board.occupied_colour[BLACK]
         self.castling_rights = board.castling_rights
+        self.piece_square_value = board.piece_square_value
+        self.piece_hash = board.piece_hash
 
     def load(self, board: Board):
         board.turn = self.turn
         board.en_passant_sq = self.en_passant_sq
         board.halfmove_clock = self.halfmove_clock
         board.fullmoves = self.fullmoves
-        board.repetitions = list(self.repetitions)
-        board.move_history = list(self.move_history)
+        board.repetitions = self.repetitions
+        del board.repetitions[self.repetitions_count:]
 
         board.pawns[BLACK] = self.b_pawns
         board.pawns[WHITE] = self.w_pawns
@@ -895,6 +930,9 @@ class _BoardState:
         board.kings[WHITE] = self.w_kings
 
         board.occupied = self.occupied
+        board.piece_types = self.piece_types  # Not copied again, the state is discarded once it has been loaded
         board.occupied_colour[WHITE] = self.occupied_colour_w
         board.occupied_colour[BLACK] = self.occupied_colour_b
         board.castling_rights = self.castling_rights
+        board.piece_square_value = self.piece_square_value
+        board.piece_hash = self.piece_hash
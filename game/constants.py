@@ -5,52 +5,44 @@ BLACK = False
 QUEENSIDE = 'queenside'
 KINGSIDE = 'kingside'
 
-FILE_NAMES = ["A", "B", "C", "D", "E", "F", "G", "H"]
-RANK_NAMES = ["1", "2", "3", "4", "5", "6", "7", "8"]
-
-PieceType = str
-PAWN = 'p'
-ROOK = 'r'
-KNIGHT = 'n'
-BISHOP = 'b'
-QUEEN = 'q'
-KING = 'k'
+FILE_NAMES = ("A", "B", "C", "D", "E", "F", "G", "H")
+RANK_NAMES = ("1", "2", "3", "4", "5", "6", "7", "8")
+
+PieceType = int
+PAWN = 1
+ROOK = 2
+KNIGHT = 3
+BISHOP = 4
+QUEEN = 5
+KING = 6
 PIECE_TYPES = (PAWN, ROOK, KNIGHT, BISHOP, QUEEN, KING)
 
-PIECE_NAMES = {
-    PAWN: 'Pawn',
-    ROOK: 'Rook',
-    KNIGHT: 'Knight',
-    BISHOP: 'Bishop',
-    QUEEN: 'Queen',
-    KING: 'King',
-}
-
-PIECE_ICONS = {
-    PAWN.upper(): '♙',
-    ROOK.upper(): '♖',
-    KNIGHT.upper(): '♘',
-    BISHOP.upper(): '♗',
-    QUEEN.upper(): '♕',
-    KING.upper(): '♔',
-    PAWN: '♟',
-    ROOK: '♜',
-    KNIGHT: '♞',
-    BISHOP: '♝',
-    QUEEN: '♛',
-    KING: '♚',
-}
-
-PIECE_VALUES = {
-    PAWN: 100,
-    KNIGHT: 320,
-    BISHOP: 330,
-    ROOK: 500,
-    QUEEN: 900,
-    KING: 20000,
-}
-
-PAWN_POSITION_BASE_VALUES = [
+# Piece tables are tuples indexed by piece type, with 0 standing in for an empty square
+PIECE_SYMBOLS = (None, 'p', 'r', 'n', 'b', 'q', 'k')
+PIECE_SYMBOL_TYPES = {symbol: piece_type for piece_type, symbol in enumerate(PIECE_SYMBOLS) if symbol}
+PIECE_CODES = (  # FEN characters, indexed by colour, then piece type
+    PIECE_SYMBOLS,
+    (None,) + tuple(symbol.upper() for symbol in PIECE_SYMBOLS[1:]),
+)
+
+PIECE_NAMES = (None, 'Pawn', 'Rook', 'Knight', 'Bishop', 'Queen', 'King')
+
+PIECE_ICONS = (  # Indexed by colour, then piece type
+    (None, '♟', '♜', '♞', '♝', '♛', '♚'),
+    (None, '♙', '♖', '♘', '♗', '♕', '♔'),
+)
+
+PIECE_VALUES = (
+    0,
+    100,  # Pawn
+    500,  # Rook
+    320,  # Knight
+    330,  # Bishop
+    900,  # Queen
+    20000,  # King
+)
+
+PAWN_POSITION_BASE_VALUES = (
      0,  0,   0,   0,   0,   0,  0,  0,
     50, 50,  50,  50,  50,  50, 50, 50,
     10, 10,  20,  30,  30,  20, 10, 10,
@@ -59,9 +51,9 @@ PAWN_POSITION_BASE_VALUES = [
      5, -5, -10,   0,   0, -10, -5,  5,
      5, 10,  10, -20, -20,  10, 10,  5,
      0,  0,   0,   0,   0,   0,  0,  0,
-]
+)
 
-KNIGHT_POSITION_BASE_VALUES = [
+KNIGHT_POSITION_BASE_VALUES = (
     -50, -40, -30, -30, -30, -30, -40, -50,
     -40, -20,   0,   0,   0,   0, -20, -40,
     -30,   0,  10,  15,  15,  10,   0, -30,
@@ -70,9 +62,9 @@ KNIGHT_POSITION_BASE_VALUES = [
     -30,   5,  10,  15,  15,  10,   5, -30,
     -40, -20,   0,   5,   5,   0, -20, -40,
     -50, -40, -30, -30, -30, -30, -40, -50,
-]
+)
 
-BISHOP_POSITION_BASE_VALUES = [
+BISHOP_POSITION_BASE_VALUES = (
     -20, -10, -10, -10, -10, -10, -10, -20,
     -10,   0,   0,   0,   0,   0,   0, -10,
     -10,   0,   5,  10,  10,   5,   0, -10,
@@ -81,9 +73,9 @@ BISHOP_POSITION_BASE_VALUES = [
     -10,  10,  10,  10,  10,  10,  10, -10,
     -10,   5,   0,   0,   0,   0,   5, -10,
     -20, -10, -10, -10, -10, -10, -10, -20,
-]
+)
 
-ROOK_POSITION_BASE_VALUES = [
+ROOK_POSITION_BASE_VALUES = (
      0,  0,  0,  0,  0,  0,  0,  0,
      5, 10, 10, 10, 10, 10, 10,  5,
     -5,  0,  0,  0,  0,  0,  0, -5,
@@ -92,9 +84,9 @@ ROOK_POSITION_BASE_VALUES = [
     -5,  0,  0,  0,  0,  0,  0, -5,
     -5,  0,  0,  0,  0,  0,  0, -5,
      0,  0,  0,  5,  5,  0,  0,  0,
-]
+)
 
-QUEEN_POSITION_BASE_VALUES = [
+QUEEN_POSITION_BASE_VALUES = (
     -20, -10, -10, -5, -5, -10, -10, -20,
     -10,   0,   0,  0,  0,   0,   0, -10,
     -10,   0,   5,  5,  5,   5,   0, -10,
@@ -103,9 +95,9 @@ QUEEN_POSITION_BASE_VALUES = [
     -10,   5,   5,  5,  5,   5,   0, -10,
     -10,   0,   5,  0,  0,   0,   0, -10,
     -20, -10, -10, -5, -5, -10, -10, -20,
-]
+)
 
-KING_POSITION_BASE_VALUES = [
+KING_POSITION_BASE_VALUES = (
     -30, -40, -40, -50, -50, -40, -40, -30,
     -30, -40, -40, -50, -50, -40, -40, -30,
     -30, -40, -40, -50, -50, -40, -40, -30,
@@ -114,9 +106,9 @@ KING_POSITION_BASE_VALUES = [
     -10, -20, -20, -20, -20, -20, -20, -10,
      20,  20,   0,   0,   0,   0,  20,  20,
      20,  30,  10,   0,   0,  10,  30,  20,
-]
+)
 
-KING_LATE_GAME_POSITION_BASE_VALUES = [
+KING_LATE_GAME_POSITION_BASE_VALUES = (
     -50, -40, -30, -20, -20, -30, -40, -50,
     -30, -20, -10,   0,   0, -10, -20, -30,
     -30, -10,  20,  30,  30,  20, -10, -30,
@@ -125,7 +117,7 @@ KING_LATE_GAME_POSITION_BASE_VALUES = [
     -30, -10,  20,  30,  30,  20, -10, -30,
     -30, -30,   0,   0,   0,   0, -30, -30,
     -50, -30, -30, -30, -30, -30, -30, -50,
-]
+)
 
 Direction = str
 NORTH = 'n'
@@ -138,7 +130,7 @@ WEST = 'w'
 NORTHWEST = 'nw'
 
 
-CARDINALS = [(1, 0), (-1, 0), (0, 1), (0, -1)]
-DIAGONALS = [(1, 1), (-1, -1), (-1, 1), (1, -1)]
+CARDINALS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+DIAGONALS = ((1, 1), (-1, -1), (-1, 1), (1, -1))
 
 STARTING_STATE = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'
@@ -1,41 +1,66 @@
 from __future__ import annotations
-from typing import Union, Optional
+from typing import Optional
 
-from game.constants import PieceType, QUEEN, ROOK, BISHOP, KNIGHT
-from game.square import Square, file_rank_to_index, char_to_file
+from game.constants import PieceType, QUEEN, ROOK, BISHOP, KNIGHT, PIECE_SYMBOLS, PIECE_SYMBOL_TYPES
+from game.exceptions import IllegalMove
+from game.square import Square, SQUARE_NAMES
+
+
+# Move generation passes moves around packed into a single int: the from square in bits 0-5, the to square in bits
+# 6-11, the promotion (as an index into PACKED_PROMOTIONS) in bits 12-14 and the castling flag in bit 15
+PACKED_PROMOTIONS = (None, QUEEN, ROOK, BISHOP, KNIGHT)
+PACKED_PROMOTION_FLAGS = tuple(i << 12 for i in range(1, len(PACKED_PROMOTIONS)))
+PACKED_CASTLING = 1 << 15
 
 
 class Move:
+    __slots__ = ('from_square', 'to_square', 'is_castling', 'promotion')
+
+    @staticmethod
+    def from_packed(packed: int) -> Move:
+        """Unpacks a move from its integer representation used in move generation."""
+        return Move(
+            packed & 63,
+            (packed >> 6) & 63,
+            is_castling=bool(packed & PACKED_CASTLING),
+            promotion=PACKED_PROMOTIONS[(packed >> 12) & 7],
+        )
+
     @staticmethod
     def from_uci(uci: str) -> Move:
-        assert len(uci) in (4, 5), "Invalid UCI"
-        pos_1 = uci[:2]
-        from_sq = file_rank_to_index(char_to_file(pos_1[0]), int(pos_1[1]) - 1)
-        pos_2 = uci[2:4]
-        to_sq = file_rank_to_index(char_to_file(pos_2[0]), int(pos_2[1]) - 1)
+        if (
+            len(uci) not in (4, 5) or
+            not ('a' <= uci[0].lower() <= 'h' and '1' <= uci[1] <= '8') or
+            not ('a' <= uci[2].lower() <= 'h' and '1' <= uci[3] <= '8') or
+            (len(uci) == 5 and uci[4] not in ('q', 'r', 'b', 'n'))
+        ):
+            raise IllegalMove(f"{uci} is not a valid UCI move.")
+        # Squares straight from the character codes: rank digits from '1' (49) and files from 'a' (97), where | 32
+        # lower cases the file
+        from_sq = ((ord(uci[1]) - 49) << 3) | ((ord(uci[0]) | 32) - 97)
+        to_sq = ((ord(uci[3]) - 49) << 3) | ((ord(uci[2]) | 32) - 97)
 
         promotion = None
         if len(uci) > 4:
-            promotion = uci[4]
+            promotion = PIECE_SYMBOL_TYPES[uci[4]]
         return Move(from_sq, to_sq, promotion=promotion)
 
     def __init__(
             self,
-            from_square: Union[Square, int],
-            to_square: Union[Square, int],
+            from_square: Square,
+            to_square: Square,
             is_castling: bool = False,
             promotion: Optional[PieceType] = None,
     ):
-        self.from_square = Square(from_square)
-        self.to_square = Square(to_square)
+        self.from_square = from_square
+        self.to_square = to_square
         self.is_castling = is_castling
-        assert promotion in (None, QUEEN, ROOK, BISHOP, KNIGHT)
         self.promotion = promotion
 
     @property
     def uci(self) -> str:
-        promotion = self.promotion if self.promotion else ''
-        return f'{str(self.from_square).lower()}{str(self.to_square).lower()}{promotion}'
+        promotion = PIECE_SYMBOLS[self.promotion] if self.promotion else ''
+        return SQUARE_NAMES[self.from_square] + SQUARE_NAMES[self.to_square] + promotion
 
     def __str__(self) -> str:
         return f'{self.uci}'
@@ -44,13 +69,12 @@ class Move:
         return f"'{str(self)}'"
 
     def __hash__(self) -> int:
-        return hash((
-            self.from_square,
-            self.to_square
-        ))
+        # Same layout as a packed move, without allocating a tuple. The castling flag is left out, as for equality
+        return self.from_square | (self.to_square << 6) | (PACKED_PROMOTIONS.index(self.promotion) << 12)
 
     def __eq__(self, other) -> bool:
         return (
             other.from_square == self.from_square and
-            other.to_square == self.to_square
+            other.to_square == self.to_square and
+            other.promotion == self.promotion
         )
\ No newline at end of file
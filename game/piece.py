@@ -2,7 +2,7 @@ from game.constants import (
     WHITE,
     BLACK,
     PieceType,
-    PIECE_TYPES,
+    PIECE_CODES,
     PIECE_NAMES,
     PIECE_VALUES,
     PIECE_ICONS,
@@ -10,6 +10,8 @@ from game.constants import (
 
 
 class Piece:
+    __slots__ = ('colour', 'type')
+
     TYPE = None
     BASE_VALUE = 0
     CASTLE_POSITIONS = {
@@ -18,8 +20,6 @@ class Piece:
     }
 
     def __init__(self, piece_type: PieceType, colour: bool = WHITE):
-        assert colour in [WHITE, BLACK], f"Invalid colour: {colour} chosen."
-        assert piece_type in PIECE_TYPES, f"Invalid piece type: {piece_type} chosen."
         self.colour = colour
         self.type = piece_type
 
@@ -30,11 +30,11 @@ class Piece:
 
     @property
     def code(self) -> str:
-        return self.type.upper() if self.colour == WHITE else self.type.lower()
+        return PIECE_CODES[self.colour][self.type]
 
     @property
     def icon(self) -> str:
-        return PIECE_ICONS[self.code]
+        return PIECE_ICONS[self.colour][self.type]
 
     @property
     def value(self) -> int:
@@ -5,6 +5,14 @@ from game.constants import (
     BLACK,
     FILE_NAMES,
     RANK_NAMES,
+    PieceType,
+    PAWN,
+    ROOK,
+    KNIGHT,
+    BISHOP,
+    QUEEN,
+    KING,
+    PIECE_VALUES,
 
     PAWN_POSITION_BASE_VALUES,
     KNIGHT_POSITION_BASE_VALUES,
@@ -17,97 +25,82 @@ from game.constants import (
 
 
 def index_to_coord(idx: int) -> str:
-    file = idx % 8
-    file = file_to_char(file)
-
-    rank = int(idx / 8)
-    return file + str(rank + 1)
+    return FILE_NAMES[idx & 7] + RANK_NAMES[idx >> 3]
 
 
 def index_to_file_rank(idx: int) -> Tuple[int, int]:
     """Converts an integer position into the corresponding file and rank (in that order)."""
-    assert 0 <= idx < 64, "Board index must be between 0 and 63."
-    return idx % 8, int(idx / 8)
+    return idx & 7, idx >> 3
 
 
 def file_rank_to_index(file: int, rank: int) -> int:
-    assert 0 <= file < 8 and 0 <= rank < 8, "Rank and file must be between 0 and 7."
-    return (rank * 8) + (file % 8)
+    return (rank << 3) | file
+
+
+# File index by name, accepting either case
+FILE_INDICES = {
+    **{name: file for file, name in enumerate(FILE_NAMES)},
+    **{name.lower(): file for file, name in enumerate(FILE_NAMES)},
+}
 
 
 def file_to_char(file: int) -> str:
-    return ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H'][file]
+    return FILE_NAMES[file]
 
 
 def char_to_file(char: str) -> int:
-    return {
-        'A': 0,
-        'B': 1,
-        'C': 2,
-        'D': 3,
-        'E': 4,
-        'F': 5,
-        'G': 6,
-        'H': 7,
-    }[char.upper()]
+    return FILE_INDICES[char]
 
 
-class Square(int):
-    @staticmethod
-    def from_file_rank(file: int, rank: int):
-        return Square(file_rank_to_index(file, rank))
+Square = int
 
-    @staticmethod
-    def from_coord(coord: str):
-        file = char_to_file(coord[0].upper())
-        rank = int(coord[1]) - 1
-        return Square(file_rank_to_index(file, rank))
 
-    @property
-    def file(self):
-        return self % 8
+def square_file(square: Square) -> int:
+    return square & 7
 
-    @property
-    def rank(self):
-        return int(self / 8)
 
-    @property
-    def colour(self):
-        return WHITE if self % 2 == 0 else BLACK
+def square_rank(square: Square) -> int:
+    return square >> 3
 
-    @property
-    def name(self):
-        return FILE_NAMES[self.file] + RANK_NAMES[self.rank]
 
-    def __str__(self):
-        return self.name
+def square_name(square: Square) -> str:
+    return FILE_NAMES[square & 7] + RANK_NAMES[square >> 3]
 
-    def __repr__(self):
-        return str(self)
+
+def square_from_coord(coord: str) -> Square:
+    file = char_to_file(coord[0])
+    rank = int(coord[1]) - 1
+    return file_rank_to_index(file, rank)
+
+
+# King step distances between every pair of squares, indexed by a * 64 + b
+SQUARE_DISTANCE = bytearray(
+    max(abs((a & 7) - (b & 7)), abs((a >> 3) - (b >> 3)))
+    for a in range(64) for b in range(64)
+)
 
 
 def square_distance(a: Square, b: Square) -> int:
     """
     Gets the distance (i.e., the number of king steps) from square *a* to *b*.
     """
-    a, b = Square(a), Square(b)
-    return max(abs(a.file - b.file), abs(a.rank - b.rank))
+    return SQUARE_DISTANCE[(a << 6) | b]
 
 
 def mirror_square(square: Square, vertical: bool = True) -> Square:
     """Returns a square position as if the game was mirrored vertically."""
     if vertical:
-        return Square(square ^ 56)
+        return square ^ 56
     else:
-        return Square(square ^ 7)
+        return square ^ 7
 
 
 def _mirror_list(_list):
-    """Returns a list of 64 elements representing the game as if the game were mirrored vertically."""
+    """Returns a tuple of 64 elements representing the game as if the game were mirrored vertically."""
     _new_list = [0] * len(_list)
     for i, val in enumerate(_list):
         _new_list[SQUARES_VFLIP[i]] = _list[i]
-    return _new_list
+    return tuple(_new_list)
 
 
 SQUARES = [
@@ -119,41 +112,64 @@ SQUARES = [
     A6, B6, C6, D6, E6, F6, G6, H6,
     A7, B7, C7, D7, E7, F7, G7, H7,
     A8, B8, C8, D8, E8, F8, G8, H8,
-] = [Square(i) for i in range(64)]
+] = tuple(range(64))
 
-SQUARES_VFLIP = [mirror_square(sq, True) for sq in SQUARES]
+SQUARES_VFLIP = tuple(mirror_square(sq, True) for sq in SQUARES)
 
-PAWN_POSITION_VALUES = {
-    WHITE: _mirror_list(PAWN_POSITION_BASE_VALUES),
-    BLACK: PAWN_POSITION_BASE_VALUES,
-}
+# Lower case square names as used in UCI and FEN, e.g. 'e4'
+SQUARE_NAMES = tuple(square_name(sq).lower() for sq in SQUARES)
 
-KNIGHT_POSITION_VALUES = {
-    WHITE: _mirror_list(KNIGHT_POSITION_BASE_VALUES),
-    BLACK: KNIGHT_POSITION_BASE_VALUES,
-}
+PAWN_POSITION_VALUES = (  # Indexed by colour
+    PAWN_POSITION_BASE_VALUES,
+    _mirror_list(PAWN_POSITION_BASE_VALUES),
+)
 
-BISHOP_POSITION_VALUES = {
-    WHITE: _mirror_list(BISHOP_POSITION_BASE_VALUES),
-    BLACK: BISHOP_POSITION_BASE_VALUES,
-}
+KNIGHT_POSITION_VALUES = (  # Indexed by colour
+    KNIGHT_POSITION_BASE_VALUES,
+    _mirror_list(KNIGHT_POSITION_BASE_VALUES),
+)
 
-ROOK_POSITION_VALUES = {
-    WHITE: _mirror_list(ROOK_POSITION_BASE_VALUES),
-    BLACK: ROOK_POSITION_BASE_VALUES,
-}
+BISHOP_POSITION_VALUES = (  # Indexed by colour
+    BISHOP_POSITION_BASE_VALUES,
+    _mirror_list(BISHOP_POSITION_BASE_VALUES),
+)
 
-QUEEN_POSITION_VALUES = {
-    WHITE: _mirror_list(QUEEN_POSITION_BASE_VALUES),
-    BLACK: QUEEN_POSITION_BASE_VALUES,
-}
+ROOK_POSITION_VALUES = (  # Indexed by colour
+    ROOK_POSITION_BASE_VALUES,
+    _mirror_list(ROOK_POSITION_BASE_VALUES),
+)
+
+QUEEN_POSITION_VALUES = (  # Indexed by colour
+    QUEEN_POSITION_BASE_VALUES,
+    _mirror_list(QUEEN_POSITION_BASE_VALUES),
+)
+
+KING_POSITION_VALUES = (  # Indexed by colour
+    KING_POSITION_BASE_VALUES,
+    _mirror_list(KING_POSITION_BASE_VALUES),
+)
+
+KING_LATE_GAME_POSITION_VALUES = (  # Indexed by colour
+    KING_LATE_GAME_POSITION_BASE_VALUES,
+    _mirror_list(KING_LATE_GAME_POSITION_BASE_VALUES),
+)
 
-KING_POSITION_VALUES = {
-    WHITE: _mirror_list(KING_POSITION_BASE_VALUES),
-    BLACK: KING_POSITION_BASE_VALUES,
-}
 
-KING_LATE_GAME_POSITION_VALUES = {
-    WHITE: _mirror_list(KING_LATE_GAME_POSITION_BASE_VALUES),
-    BLACK: KING_LATE_GAME_POSITION_BASE_VALUES,
-}
\ No newline at end of file
+def _signed_values(piece_type: PieceType, position_values: tuple) -> tuple:
+    return (
+        tuple(-(PIECE_VALUES[piece_type] + val) for val in position_values[BLACK]),
+        tuple(PIECE_VALUES[piece_type] + val for val in position_values[WHITE]),
+    )
+
+
+# Material plus position value of a piece, positive for white and negative for black. Indexed by piece type, colour
+# and square. The King's position value depends on the stage of the game, so only its material is included.
+PIECE_SQUARE_VALUES = (
+    None,
+    _signed_values(PAWN, PAWN_POSITION_VALUES),
+    _signed_values(ROOK, ROOK_POSITION_VALUES),
+    _signed_values(KNIGHT, KNIGHT_POSITION_VALUES),
+    _signed_values(BISHOP, BISHOP_POSITION_VALUES),
+    _signed_values(QUEEN, QUEEN_POSITION_VALUES),
+    _signed_values(KING, ((0,) * 64, (0,) * 64)),
+)
\ No newline at end of file
@@ -0,0 +1,20 @@
+import random
+
+from game.constants import PIECE_TYPES
+
+# Fixed seed so that hashes are stable between runs
+_random = random.Random(0xC0FFEE)
+
+
+def _random_keys(n: int) -> tuple:
+    return tuple(_random.getrandbits(64) for _ in range(n))
+
+
+# Random 64-bit keys XORed together to hash a position. Piece keys are indexed by piece type, colour and square
+ZOBRIST_PIECES = (None,) + tuple(
+    (_random_keys(64), _random_keys(64))  # Indexed by colour
+    for _ in PIECE_TYPES
+)
+ZOBRIST_CASTLING = _random_keys(64)  # Indexed by the square of a rook that can still castle
+ZOBRIST_EN_PASSANT = _random_keys(8)  # Indexed by file
+ZOBRIST_WHITE_TURN = _random.getrandbits(64)
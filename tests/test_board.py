@@ -19,6 +19,10 @@ class TestBitboard(unittest.TestCase):
         self.assertEqual(BB_RAYS[WEST][D5], 30064771072)
         self.assertEqual(BB_RAYS[NORTHWEST][D5], 72624942037860352)
 
+        self.assertEqual(BB_LINE[D5][F7], BB_RAYS[NORTHEAST][D5] | BB_RAYS[SOUTHWEST][D5] | BB_D5)
+        self.assertEqual(BB_LINE[D5][D1], BB_FILE_D)
+        self.assertEqual(BB_LINE[D5][E7], BB_EMPTY)
+
     def test_print(self):
         _board = BB_A1
         match = ("""
@@ -86,6 +90,12 @@ class TestBitboard(unittest.TestCase):
    A  B  C  D  E  F  G  H """)
             self.assertEqual(str(_board), match)
 
+    def test_invalid_fen(self):
+        with self.assertRaises(ValueError):
+            Board('rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNX w KQkq - 0 1')
+        with self.assertRaises(ValueError):
+            Board('rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR x KQkq - 0 1')
+
     def test_value(self):
         for fen, val in (
             (STARTING_STATE, 0),
@@ -104,6 +114,57 @@ class TestBitboard(unittest.TestCase):
             _board = Board(fen=fen)
             self.assertEqual(_board.weighted_value, val)
 
+    def test_weighted_value_incremental(self):
+        _board = Board()
+        for uci in ('e2e4', 'd7d5', 'e4d5', 'd8d5', 'b1c3', 'd5a2', 'a1a2'):
+            _board.make_move(Move.from_uci(uci))
+            self.assertEqual(_board.weighted_value, Board(fen=_board.fen).weighted_value)
+
+        for _ in range(7):
+            _board.unmake_move()
+        self.assertEqual(_board.weighted_value, 0)
+
+    def test_zobrist_hash(self):
+        start_hash = Board().zobrist_hash
+
+        # Transpositions reach the same position and so the same hash
+        _board_1, _board_2 = Board(), Board()
+        for m in ('g1f3', 'g8f6', 'b1c3', 'b8c6'):
+            _board_1.make_move(m)
+        for m in ('b1c3', 'b8c6', 'g1f3', 'g8f6'):
+            _board_2.make_move(m)
+        self.assertEqual(_board_1.zobrist_hash, _board_2.zobrist_hash)
+        self.assertNotEqual(_board_1.zobrist_hash, start_hash)
+
+        # Turn, castling rights and en passant are part of the position
+        self.assertNotEqual(Board(STARTING_STATE.replace(' w ', ' b ')).zobrist_hash, start_hash)
+        _castling = Board('r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1')
+        castling_hash = _castling.zobrist_hash
+        for m in ('h1g1', 'a8b8', 'g1h1', 'b8a8'):  # Same placement, but some castling rights lost
+            _castling.make_move(m)
+        self.assertNotEqual(_castling.zobrist_hash, castling_hash)
+
+        _board_1.unmake_move()
+        _board_1.unmake_move()
+        _board_1.unmake_move()
+        _board_1.unmake_move()
+        self.assertEqual(_board_1.zobrist_hash, start_hash)
+
+        # Hashed incrementally as pieces move, including captures, castling, en passant and promotion
+        _board = Board('r3k2r/1P6/8/8/3p4/8/4P3/R3K2R w KQkq - 0 1')
+        for uci in ('e2e4', 'd4e3', 'e1g1', 'e8c8', 'b7a8q', 'd8d1'):
+            _board.make_move(Move.from_uci(uci))
+            self.assertEqual(_board.zobrist_hash, Board(fen=_board.fen).zobrist_hash)
+
+    def test_mobility(self):
+        for fen, white, black in (
+            (STARTING_STATE, 20, 20),
+            ('rn1qk3/p1p1p3/8/3Q4/8/8/PPPPPP1P/RNBQKBNR b - - 0 1', 43, 16),
+        ):
+            _board = Board(fen=fen)
+            self.assertEqual(_board.mobility(WHITE), white)
+            self.assertEqual(_board.mobility(BLACK), black)
+
 def main():
     unittest.main()
 
@@ -12,7 +12,7 @@ class TestMoves(unittest.TestCase):
             'e1f1', 'e1d1',
         }
         bb = Board('rnbqkbnr/ppp1pppp/8/8/1Bp1R2P/1P1Q1PB1/P1PPP1P1/RN2K1N1 w Qkq - 0 1')
-        white_moves = {m.uci for m in bb._pseudo_legal_moves(WHITE)}
+        white_moves = {Move.from_packed(m).uci for m in bb._pseudo_legal_moves(WHITE)}
         self.assertEqual(white_moves, match)
 
     def test_check(self):
@@ -58,6 +58,11 @@ class TestMoves(unittest.TestCase):
         with self.assertRaises(IllegalMove):
             bb.make_move(Move.from_uci('b2b3'))
         bb.make_move(Move.from_uci('G8F6'))
+        for uci in ('g8', 'z9a1', 'e2e9', 'i2e4', 'e0e4', 'e7e8x', 'e7e8Q', 'e7e8k'):
+            with self.assertRaises(IllegalMove):
+                Move.from_uci(uci)
+        with self.assertRaises(IllegalMove):
+            bb.make_safe_move('e2e9')
         self.assertEqual(bb.fen, 'rnbqkb1r/pppppppp/5n2/8/8/2P5/PP1PPPPP/RNBQKBNR w KQkq - 1 2')
 
     def test_legal_castling(self):
@@ -139,6 +144,13 @@ class TestMoves(unittest.TestCase):
         b.unmake_move()
         b.make_move(Move.from_uci('g7g8q'))
         self.assertEqual(b.fen, 'rnbqr1Q1/pppp4/3k1n1p/2p1p3/3b4/8/PPPPPP1P/RNBQKBNR b KQ - 0 1')
+        b.unmake_move()
+
+        # Each promotion is a distinct move, and a move without one (e.g. from the web UI) promotes to a Queen
+        self.assertNotEqual(Move.from_uci('g7g8q'), Move.from_uci('g7g8n'))
+        self.assertEqual(len({m for m in b.legal_moves if m.from_square == G7}), 4)
+        b.make_safe_move(Move(G7, G8))
+        self.assertEqual(b.fen, 'rnbqr1Q1/pppp4/3k1n1p/2p1p3/3b4/8/PPPPPP1P/RNBQKBNR b KQ - 0 1')
 
 
     def test_checkmate(self):
@@ -209,6 +221,40 @@ class TestMoves(unittest.TestCase):
         _board.make_move(Move.from_uci('h2h3'))
         self.assertFalse(_board.has_threefold_repetition)
 
+    def test_ordered_moves(self):
+        _board = Board('k7/8/8/3q4/4P3/8/8/K2Q4 w - - 0 1')
+        ordered = [m.uci for m in _board.ordered_legal_moves]
+        self.assertEqual(ordered[:2], ['e4d5', 'd1d5'])  # Pawn takes queen before queen takes queen
+        self.assertEqual(set(ordered), {m.uci for m in _board.legal_moves})
+        self.assertEqual([m.uci for m in _board.ordered_moves(captures_only=True)], ['e4d5', 'd1d5'])
+
+        # En passant is a capture, even though the target square is empty
+        _board = Board('k7/8/8/3pP3/8/8/8/K7 w - d6 0 1')
+        self.assertEqual(_board.ordered_legal_moves[0].uci, 'e5d6')
+        self.assertEqual([m.uci for m in _board.ordered_moves(captures_only=True)], ['e5d6'])
+
+    def test_legal_moves_cache(self):
+        _board = Board()
+        self.assertIs(_board.legal_moves, _board.legal_moves)
+        self.assertEqual(len(_board.legal_moves), 20)
+
+        _board.make_move(Move.from_uci('e2e4'))
+        self.assertEqual({m.uci for m in _board.legal_moves if m.from_square == E7}, {'e7e6', 'e7e5'})
+        _board.unmake_move()
+        self.assertEqual(len(_board.legal_moves), 20)
+
+        _board.remove_piece(E2)
+        self.assertEqual(len(_board.legal_moves), 29)
+        _board.place_piece(E2, PAWN, WHITE)
+        self.assertEqual(len(_board.legal_moves), 20)
+
+        for m in ('e2e4', 'd7d6', 'd1h5', 'a7a6'):
+            _board.make_move(Move.from_uci(m))
+        self.assertFalse(_board.is_in_check)
+        _board.make_move(Move.from_uci('h5f7'))
+        self.assertTrue(_board.is_in_check)
+        self.assertEqual({m.uci for m in _board.legal_moves}, {'e8d7', 'e8f7'})
+
 
 def main():
     unittest.main()
@@ -3,8 +3,8 @@ from flask import request
 
 import log
 from ai import algorithms
-from game.constants import WHITE
-from game.board import Board, Move, SQUARES_VFLIP
+from game.constants import WHITE, PIECE_SYMBOLS
+from game.board import Board, Move, SQUARES_VFLIP, square_file, square_rank
 from game.exceptions import IllegalMove, Checkmate, Draw
 from web.server import app
 
@@ -25,18 +25,18 @@ def _log_exception(board: Board, e: Exception):
 def _json_board(board: Board, params: Optional[Dict] = None):
     by_rank = {}
     for sq in SQUARES_VFLIP:
-        rank = sq.rank
+        rank = square_rank(sq)
         by_rank[rank] = by_rank.get(rank, [])
 
         _square = {
-            'rank': sq.rank,
-            'file': sq.file,
-            'index': int(sq),
+            'rank': rank,
+            'file': square_file(sq),
+            'index': sq,
         }
 
         piece = board.piece_at(sq)
         if piece:
-            _square['piece'] = piece.type
+            _square['piece'] = PIECE_SYMBOLS[piece.type]
             _square['piece_colour'] = 'white' if piece.colour else 'black'
 
         by_rank[rank].append(_square)